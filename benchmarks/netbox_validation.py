@@ -0,0 +1,138 @@
+"""
+Microbenchmark for NetBox page validation.
+
+Compares the old `model_validate(json.loads(...))` path against validating the
+raw response bytes with the cached TypeAdapters, and against the TRUSTED and
+RAW validation modes.
+
+Run from the repository root:
+    python -m benchmarks.netbox_validation
+"""
+
+import json
+import timeit
+
+from src.services.netbox.models import (
+    DEVICE_PAGE_ADAPTER,
+    IP_ADDRESS_PAGE_ADAPTER,
+    PaginatedDeviceList,
+    PaginatedIPAddressList,
+)
+from src.services.netbox.validation import ResponseDecoder, ValidationMode
+
+BASE_URL = "https://netbox.example.com/api"
+PAGE_SIZE = 1000
+REPEAT = 5
+NUMBER = 10
+
+
+def brief(kind: str, obj_id: int, **extra):
+    return {
+        "id": obj_id,
+        "url": f"{BASE_URL}/{kind}/{obj_id}/",
+        "display": f"{kind}-{obj_id}",
+        **extra,
+    }
+
+
+def named(kind: str, obj_id: int):
+    slug = f"{kind.rsplit('/', 1)[-1]}-{obj_id}"
+    return brief(kind, obj_id, name=slug, slug=slug)
+
+
+def ip(obj_id: int):
+    address = f"10.{obj_id // 65536 % 256}.{obj_id // 256 % 256}.{obj_id % 256}/32"
+    return brief(
+        "ipam/ip-addresses",
+        obj_id,
+        family={"value": 4, "label": "IPv4"},
+        address=address,
+    )
+
+
+def device(obj_id: int):
+    return {
+        **brief("dcim/devices", obj_id),
+        "name": f"device-{obj_id}",
+        "device_type": {
+            **named("dcim/device-types", 1),
+            "model": "R640",
+            "manufacturer": named("dcim/manufacturers", 1),
+        },
+        "role": named("dcim/device-roles", 1),
+        "tenant": named("tenancy/tenants", 1),
+        "platform": named("dcim/platforms", 1),
+        "serial": f"SN{obj_id:08d}",
+        "site": named("dcim/sites", obj_id % 10),
+        "location": named("dcim/locations", 1),
+        "rack": brief("dcim/racks", 1, name="rack-1"),
+        "status": {"value": "active", "label": "Active"},
+        "primary_ip": ip(obj_id),
+        "primary_ip4": ip(obj_id),
+        "tags": [{**named("extras/tags", 1), "color": "aa1409"}],
+        "custom_fields": {"salt_id": f"device-{obj_id}", "cpu_cores": 32},
+        "created": "2024-03-01T10:00:00.000000Z",
+        "last_updated": "2025-06-01T10:00:00.000000Z",
+    }
+
+
+def ip_address(obj_id: int):
+    return {
+        **ip(obj_id),
+        "vrf": brief("ipam/vrfs", 1, name="global"),
+        "tenant": named("tenancy/tenants", 1),
+        "status": {"value": "active", "label": "Active"},
+        "role": {"value": "vip", "label": "VIP"},
+        "dns_name": f"host-{obj_id}.example.com",
+        "tags": [],
+        "custom_fields": {},
+        "created": "2024-03-01T10:00:00.000000Z",
+        "last_updated": "2025-06-01T10:00:00.000000Z",
+    }
+
+
+def page(results):
+    return json.dumps(
+        {"count": len(results), "next": None, "previous": None, "results": results}
+    ).encode()
+
+
+def bench(label, func):
+    best = min(timeit.repeat(func, repeat=REPEAT, number=NUMBER)) / NUMBER
+    print(f"  {label:<32} {best * 1000:8.2f} ms/page")
+    return best
+
+
+def main():
+    cases = [
+        (
+            "devices",
+            page([device(i) for i in range(PAGE_SIZE)]),
+            PaginatedDeviceList,
+            DEVICE_PAGE_ADAPTER,
+        ),
+        (
+            "ip addresses",
+            page([ip_address(i) for i in range(PAGE_SIZE)]),
+            PaginatedIPAddressList,
+            IP_ADDRESS_PAGE_ADAPTER,
+        ),
+    ]
+    for name, content, model, adapter in cases:
+        print(f"{name} ({PAGE_SIZE} objects, {len(content) / 1024:.0f} KiB):")
+        before = bench(
+            "model_validate(json.loads())",
+            lambda: model.model_validate(json.loads(content)),
+        )
+        after = bench(
+            "adapter.validate_json(bytes)", lambda: adapter.validate_json(content)
+        )
+        print(f"  speedup: {before / after:.2f}x")
+        for mode in (ValidationMode.TRUSTED, ValidationMode.RAW):
+            decoder = ResponseDecoder(model, adapter, mode)
+            elapsed = bench(f"{mode.value} decode", lambda: decoder.decode(content))
+            print(f"  speedup: {before / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
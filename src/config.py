@@ -1,9 +1,19 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Tuple
 
 import yaml
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
+
+from src.services.netbox.bulk import BulkConfig
+from src.services.netbox.cache import CacheConfig
+from src.services.netbox.pagination import PaginationConfig
+from src.services.netbox.validation import ValidationMode
+from src.services.retry import DEFAULT_RETRY_BUDGET
+from src.services.salt.batching import BatchConfig
+from src.services.salt.keys import KeyCacheConfig
+from src.services.salt.master_cache import MasterCacheConfig
+from src.services.transport import HTTPConfig
 
 
 def format_datetime(dt):
@@ -67,12 +77,32 @@ class SaltConfig(BaseModel):
     username: str
     password: str
     target_version: str
+    http: HTTPConfig = HTTPConfig()
+    master_cache: Optional[MasterCacheConfig] = None
+    batch: Optional[BatchConfig] = None
+    key_cache: Optional[KeyCacheConfig] = None
 
 
 class NetBoxConfig(BaseModel):
     base_url: HttpUrl
     api_token: str
     ssl: bool
+    pagination: PaginationConfig = PaginationConfig()
+    validation: ValidationMode = ValidationMode.STRICT
+    incremental: bool = False
+    full_sweep_interval: timedelta = timedelta(hours=24)
+    bulk: BulkConfig = BulkConfig()
+    batch_gets: bool = False
+    cache: Optional[CacheConfig] = None
+    response_cache: bool = False
+    http: HTTPConfig = HTTPConfig(timeout=20.0)
+
+
+class GatewayConfig(BaseModel):
+    default_timeout: float = Field(600.0, gt=0, description="Seconds per source")
+    timeouts: Dict[str, float] = Field(
+        default_factory=dict, description="Per-source overrides, keyed by name"
+    )
 
 
 class PathsConfig(BaseModel):
@@ -86,10 +116,12 @@ class OutputConfig(BaseModel):
 
 class Settings(BaseModel):
     log_level: str
+    retry_budget: int = DEFAULT_RETRY_BUDGET
     xen: Dict[str, XenDatacenterConfig]
     aws: Dict[str, AWSAccountConfig]
     salt: SaltConfig
     netbox: NetBoxConfig
+    gateway: GatewayConfig = GatewayConfig()
     paths: PathsConfig
     output: OutputConfig
     device_export_map: Dict[str, Tuple[str, Optional[Callable]]]
@@ -1,9 +1,12 @@
 import json
 import logging
+from datetime import timedelta
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
+from src.etl.incremental import DEFAULT_FULL_SWEEP_INTERVAL, sync_netbox_objects
 from src.services.netbox.client import NetBoxAPIClient
+from src.services.netbox.models import Device, IPAddress, VirtualMachine
 
 log = logging.getLogger(__name__)
 
@@ -23,12 +26,23 @@ def extract_json_data(file_paths: List[Path]) -> List[Dict[str, Any]]:
 
 async def list_netbox_ips(
     client: NetBoxAPIClient,
+    snapshot_dir: Optional[Path] = None,
+    full_sweep_interval: timedelta = DEFAULT_FULL_SWEEP_INTERVAL,
 ):
     ips_list = []
     try:
         log.info("Fetching IP addresses from NetBox...")
-        async for ip in client.ips.list():
-            ips_list.append(ip)
+        if snapshot_dir:
+            ips_list = await sync_netbox_objects(
+                client.ips,
+                snapshot_dir / "ip_addresses.json",
+                IPAddress,
+                full_sweep_interval,
+                client.validation,
+            )
+        else:
+            async for ip in client.ips.list():
+                ips_list.append(ip)
         log.info(f"Fetched {len(ips_list)} IPs.")
         return ips_list
     except Exception as e:
@@ -37,12 +51,23 @@ async def list_netbox_ips(
 
 async def list_netbox_vms(
     client: NetBoxAPIClient,
+    snapshot_dir: Optional[Path] = None,
+    full_sweep_interval: timedelta = DEFAULT_FULL_SWEEP_INTERVAL,
 ):
     vms_list = []
     try:
         log.info("Fetching Virtual Machines from NetBox...")
-        async for ip in client.vms.list():
-            vms_list.append(ip)
+        if snapshot_dir:
+            vms_list = await sync_netbox_objects(
+                client.vms,
+                snapshot_dir / "virtual_machines.json",
+                VirtualMachine,
+                full_sweep_interval,
+                client.validation,
+            )
+        else:
+            async for ip in client.vms.list():
+                vms_list.append(ip)
         log.info(f"Fetched {len(vms_list)} VMs.")
         return vms_list
     except Exception as e:
@@ -51,13 +76,69 @@ async def list_netbox_vms(
 
 async def list_netbox_devices(
     client: NetBoxAPIClient,
+    snapshot_dir: Optional[Path] = None,
+    full_sweep_interval: timedelta = DEFAULT_FULL_SWEEP_INTERVAL,
 ):
     devices_list = []
     try:
         log.info("Fetching Devices from NetBox...")
-        async for ip in client.devices.list():
-            devices_list.append(ip)
+        if snapshot_dir:
+            devices_list = await sync_netbox_objects(
+                client.devices,
+                snapshot_dir / "devices.json",
+                Device,
+                full_sweep_interval,
+                client.validation,
+            )
+        else:
+            async for ip in client.devices.list():
+                devices_list.append(ip)
         log.info(f"Fetched {len(devices_list)} Devices.")
         return devices_list
     except Exception as e:
         log.error(f"An unexpected error occurred: {e}")
+
+
+async def _stream(
+    endpoint: Any, kind: str, chunk_size: Optional[int] = None
+) -> AsyncIterator[Union[Any, List[Any]]]:
+    log.info(f"Streaming {kind} from NetBox...")
+    count = 0
+    chunk: List[Any] = []
+    async for obj in endpoint.list():
+        count += 1
+        if chunk_size is None:
+            yield obj
+            continue
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+    log.info(f"Streamed {count} {kind}.")
+
+
+def stream_netbox_ips(
+    client: NetBoxAPIClient, chunk_size: Optional[int] = None
+) -> AsyncIterator[Union[IPAddress, List[IPAddress]]]:
+    """
+    Yields IP addresses as their pages arrive, or lists of up to
+    `chunk_size` of them. Unlike `list_netbox_ips`, nothing is accumulated
+    and errors are raised to the caller.
+    """
+    return _stream(client.ips, "IPs", chunk_size)
+
+
+def stream_netbox_vms(
+    client: NetBoxAPIClient, chunk_size: Optional[int] = None
+) -> AsyncIterator[Union[VirtualMachine, List[VirtualMachine]]]:
+    """Streaming counterpart of `list_netbox_vms`, see `stream_netbox_ips`."""
+    return _stream(client.vms, "VMs", chunk_size)
+
+
+def stream_netbox_devices(
+    client: NetBoxAPIClient, chunk_size: Optional[int] = None
+) -> AsyncIterator[Union[Device, List[Device]]]:
+    """Streaming counterpart of `list_netbox_devices`, see `stream_netbox_ips`."""
+    return _stream(client.devices, "Devices", chunk_size)
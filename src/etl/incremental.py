@@ -0,0 +1,119 @@
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+from src.services.netbox.models import ListFilter
+from src.services.netbox.validation import ValidationMode, object_id, trusted_model
+
+log = logging.getLogger(__name__)
+
+DEFAULT_FULL_SWEEP_INTERVAL = timedelta(hours=24)
+
+
+class NetBoxSnapshot(BaseModel):
+    """Locally persisted copy of one NetBox endpoint plus its sync watermarks."""
+
+    watermark: Optional[datetime] = None
+    last_full_sync: Optional[datetime] = None
+    objects: Dict[int, Any] = {}
+
+
+def load_snapshot(path: Path) -> NetBoxSnapshot:
+    try:
+        with open(path, "rb") as file:
+            return NetBoxSnapshot.model_validate_json(file.read())
+    except FileNotFoundError:
+        return NetBoxSnapshot()
+    except ValueError as e:
+        log.warning(f"Discarding unreadable snapshot {path}: {e}")
+        return NetBoxSnapshot()
+
+
+def save_snapshot(path: Path, snapshot: NetBoxSnapshot) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(snapshot.model_dump_json().encode())
+    os.replace(tmp_path, path)
+
+
+def _restore_objects(
+    objects: Dict[int, Any], model: type[BaseModel], validation: ValidationMode
+) -> Dict[int, Any]:
+    # Rebuild the stored objects as the endpoint decodes them, so incremental
+    # runs return the same types as full sweeps.
+    if validation == ValidationMode.RAW:
+        return dict(objects)
+    if validation == ValidationMode.TRUSTED:
+        model = trusted_model(model)
+    return TypeAdapter(Dict[int, model]).validate_python(objects)
+
+
+def _last_updated(obj: Any) -> Optional[datetime]:
+    value = obj.get("last_updated") if isinstance(obj, dict) else obj.last_updated
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value
+
+
+async def sync_netbox_objects(
+    endpoint: Any,
+    snapshot_path: Path,
+    model: type[BaseModel],
+    full_sweep_interval: timedelta = DEFAULT_FULL_SWEEP_INTERVAL,
+    validation: ValidationMode = ValidationMode.STRICT,
+) -> List[Any]:
+    """
+    Brings the snapshot at `snapshot_path` up to date and returns its objects.
+
+    `validation` must be the mode of the client `endpoint` belongs to; stored
+    objects are rebuilt the same way, as `model`, its trusted variant or dicts.
+
+    Only objects with `last_updated` at or after the stored high-water mark
+    are fetched from `endpoint` and merged into the snapshot. Deletions are
+    invisible to that query, so a full sweep replaces the snapshot whenever
+    the last one is older than `full_sweep_interval`.
+    """
+    snapshot = load_snapshot(snapshot_path)
+    now = datetime.now(timezone.utc)
+    full_sweep = (
+        snapshot.watermark is None
+        or snapshot.last_full_sync is None
+        or now - snapshot.last_full_sync >= full_sweep_interval
+    )
+
+    if full_sweep:
+        log.info(f"Running full NetBox sweep for {snapshot_path.name}")
+        objects: Dict[int, Any] = {}
+        filters = None
+    else:
+        log.info(
+            f"Fetching objects changed since {snapshot.watermark.isoformat()} "
+            f"for {snapshot_path.name}"
+        )
+        objects = _restore_objects(snapshot.objects, model, validation)
+        filters = ListFilter(last_updated__gte=snapshot.watermark)
+
+    watermark = None if full_sweep else snapshot.watermark
+    changed = 0
+    async for obj in endpoint.list(filters=filters):
+        objects[object_id(obj)] = obj
+        changed += 1
+        last_updated = _last_updated(obj)
+        if last_updated and (watermark is None or last_updated > watermark):
+            watermark = last_updated
+
+    snapshot.objects = objects
+    snapshot.watermark = watermark
+    if full_sweep:
+        snapshot.last_full_sync = now
+    save_snapshot(snapshot_path, snapshot)
+    log.info(
+        f"{snapshot_path.name}: {changed} objects fetched, "
+        f"{len(objects)} objects in snapshot."
+    )
+    return list(objects.values())
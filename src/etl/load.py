@@ -1,8 +1,9 @@
 import logging
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, AsyncIterable, Callable, Dict, List, Optional, Tuple
 
-from src.utils.csv import write_csv
+from src.utils.csv import write_csv, write_csv_stream
+from src.utils.parse import create_parser
 
 log = logging.getLogger(__name__)
 
@@ -60,3 +61,22 @@ def export_report_to_csv(
         write_csv(csv_filepath, header, rows)
     except Exception as e:
         log.error(f"Unhandled exceprion exporting report to csv: {e}")
+
+
+async def export_objects_to_csv(
+    file_path: Path,
+    column_map: Dict[str, Tuple[str, Optional[Callable]]],
+    chunks: AsyncIterable[List[Any]],
+) -> int:
+    """
+    Parses chunks of objects with `column_map` and appends them to a CSV
+    file as they arrive, so memory use is bounded by the chunk size.
+    """
+    parser = create_parser(column_map)
+
+    async def row_chunks():
+        async for chunk in chunks:
+            _, rows = parser(chunk)
+            yield rows
+
+    return await write_csv_stream(file_path, list(column_map), row_chunks())
@@ -0,0 +1,219 @@
+import asyncio
+import inspect
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from functools import partial
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+log = logging.getLogger(__name__)
+
+
+class Offload(str, Enum):
+    NONE = "none"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class StageStats(BaseModel):
+    items_in: int = 0
+    items_out: int = 0
+    busy_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+    max_queue_depth: int = 0
+    queue_depth_total: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second of stage wall time."""
+        return self.items_in / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def avg_queue_depth(self) -> float:
+        """Average input queue depth seen by the workers when they took an item."""
+        return self.queue_depth_total / self.items_in if self.items_in else 0.0
+
+
+class Stage:
+    """
+    One step of a `Pipeline`.
+
+    `func` receives one item and returns the item for the next stage; None
+    drops the item, and with `flatten` every element of the returned
+    iterable is passed on separately. Coroutine functions are awaited on the
+    event loop. Plain functions run inline, or in a thread or process pool
+    according to `offload`, which is what CPU-heavy steps such as parsing
+    should use. Functions run in a process pool must be picklable, i.e.
+    defined at module level.
+
+    `workers` items are processed concurrently, and at most `queue_size`
+    items wait in front of the stage before upstream stages are paused.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        workers: int = 1,
+        queue_size: int = 100,
+        offload: Offload = Offload.NONE,
+        flatten: bool = False,
+    ):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.queue_size = queue_size
+        self.offload = offload
+        self.flatten = flatten
+        self.stats = StageStats()
+
+
+_END = object()
+
+
+def _leaf_exceptions(group: BaseExceptionGroup) -> List[BaseException]:
+    leaves: List[BaseException] = []
+    for error in group.exceptions:
+        if isinstance(error, BaseExceptionGroup):
+            leaves.extend(_leaf_exceptions(error))
+        else:
+            leaves.append(error)
+    return leaves
+
+
+class Pipeline:
+    """
+    Runs `source` through `stages` with every stage working concurrently.
+
+    Stages are connected by bounded queues, so a slow stage applies
+    backpressure all the way up to the source instead of letting items pile
+    up in memory. The first exception raised by any stage or the source
+    cancels the whole pipeline and is re-raised from `run`. Outputs of the
+    last stage are discarded; it is expected to be the load step.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterable[Any],
+        stages: List[Stage],
+        max_workers: Optional[int] = None,
+    ):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.source = source
+        self.stages = stages
+        self.max_workers = max_workers
+        self.__executors: Dict[Offload, Executor] = {}
+
+    @property
+    def stats(self) -> Dict[str, StageStats]:
+        return {stage.name: stage.stats for stage in self.stages}
+
+    async def run(self) -> Dict[str, StageStats]:
+        queues: List[asyncio.Queue] = [
+            asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages
+        ]
+        started = time.perf_counter()
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._feed(queues[0], self.stages[0].workers))
+                for index, stage in enumerate(self.stages):
+                    outbox = queues[index + 1] if index + 1 < len(queues) else None
+                    downstream_workers = self.stages[index + 1].workers if outbox else 0
+                    tg.create_task(
+                        self._run_stage(
+                            stage, queues[index], outbox, downstream_workers
+                        )
+                    )
+        except BaseExceptionGroup as group:
+            errors = _leaf_exceptions(group)
+            if len(errors) == 1:
+                raise errors[0] from None
+            raise
+        finally:
+            for executor in self.__executors.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+            self.__executors.clear()
+
+        log.info(f"Pipeline finished in {time.perf_counter() - started:.2f}s.")
+        for stage in self.stages:
+            stats = stage.stats
+            log.info(
+                f"Stage {stage.name}: {stats.items_in} in, {stats.items_out} out, "
+                f"{stats.throughput:.1f} items/s, busy {stats.busy_seconds:.2f}s, "
+                f"queue depth max {stats.max_queue_depth} "
+                f"avg {stats.avg_queue_depth:.1f}"
+            )
+        return self.stats
+
+    async def _feed(self, queue: asyncio.Queue, workers: int):
+        async for item in self.source:
+            await queue.put(item)
+        for _ in range(workers):
+            await queue.put(_END)
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        downstream_workers: int,
+    ):
+        started = time.perf_counter()
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(stage.workers):
+                tg.create_task(self._worker(stage, inbox, outbox))
+        stage.stats.elapsed_seconds = time.perf_counter() - started
+        if outbox is not None:
+            for _ in range(downstream_workers):
+                await outbox.put(_END)
+
+    async def _worker(
+        self, stage: Stage, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue]
+    ):
+        stats = stage.stats
+        while True:
+            depth = inbox.qsize()
+            item = await inbox.get()
+            if item is _END:
+                return
+            stats.items_in += 1
+            stats.queue_depth_total += depth
+            stats.max_queue_depth = max(stats.max_queue_depth, depth)
+
+            busy_from = time.perf_counter()
+            result = await self._call(stage, item)
+            stats.busy_seconds += time.perf_counter() - busy_from
+
+            if result is None:
+                continue
+            outputs: Iterable[Any] = result if stage.flatten else (result,)
+            for output in outputs:
+                stats.items_out += 1
+                if outbox is not None:
+                    await outbox.put(output)
+
+    async def _call(self, stage: Stage, item: Any) -> Any:
+        if inspect.iscoroutinefunction(stage.func):
+            return await stage.func(item)
+        if stage.offload == Offload.NONE:
+            return stage.func(item)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor(stage.offload), partial(stage.func, item)
+        )
+
+    def _executor(self, offload: Offload) -> Executor:
+        executor = self.__executors.get(offload)
+        if executor is None:
+            if offload == Offload.PROCESS:
+                executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="pipeline"
+                )
+            self.__executors[offload] = executor
+        return executor
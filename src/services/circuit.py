@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import time
+from enum import Enum
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from pydantic import BaseModel, Field
+
+log = logging.getLogger(__name__)
+
+FAILURE_STATUS_CODES = {502, 503, 504}
+
+_PROBE_HEADERS = {"accept", "authorization", "x-auth-token", "user-agent"}
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreakerConfig(BaseModel):
+    failure_threshold: int = Field(
+        5, ge=1, description="Consecutive failures that open the circuit"
+    )
+    reset_timeout: float = Field(
+        30.0, gt=0, description="Seconds between recovery probes"
+    )
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker for one upstream service.
+
+    After `failure_threshold` consecutive connection errors or 502/503/504
+    responses the circuit opens and requests fail immediately with
+    `CircuitOpenError`. Every `reset_timeout` seconds the circuit goes
+    half-open and a background task calls `probe`; success closes it and
+    failure keeps it open. Without a probe, the first request made after
+    `reset_timeout` is let through as the trial instead.
+    """
+
+    def __init__(self, config: Optional[CircuitBreakerConfig] = None, name: str = ""):
+        self.config = config or CircuitBreakerConfig()
+        self.name = name
+        self.state = CircuitState.CLOSED
+        self.probe: Optional[Callable[[], Awaitable[bool]]] = None
+        self.__failures = 0
+        self.__opened_at = 0.0
+        self.__probe_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != CircuitState.CLOSED
+
+    def before_request(self):
+        if self.state == CircuitState.CLOSED:
+            return
+        if (
+            self.state == CircuitState.OPEN
+            and self.probe is None
+            and time.monotonic() - self.__opened_at >= self.config.reset_timeout
+        ):
+            log.info(
+                f"{self.name or 'Service'} circuit half-open, sending trial request."
+            )
+            self.state = CircuitState.HALF_OPEN
+            return
+        raise CircuitOpenError(f"{self.name or 'Service'} circuit is open")
+
+    def record_success(self):
+        if self.state != CircuitState.CLOSED:
+            log.info(f"{self.name or 'Service'} recovered, circuit closed.")
+        self.state = CircuitState.CLOSED
+        self.__failures = 0
+
+    def record_failure(self):
+        self.__failures += 1
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.__failures >= self.config.failure_threshold
+        ):
+            self._open()
+
+    def _open(self):
+        if self.state != CircuitState.OPEN:
+            log.warning(
+                f"{self.name or 'Service'} circuit opened after "
+                f"{self.__failures} consecutive failures."
+            )
+        self.state = CircuitState.OPEN
+        self.__opened_at = time.monotonic()
+        if self.probe is not None and (
+            self.__probe_task is None or self.__probe_task.done()
+        ):
+            self.__probe_task = asyncio.create_task(self._probe_until_closed())
+
+    async def _probe_until_closed(self):
+        assert self.probe is not None
+        while self.state != CircuitState.CLOSED:
+            await asyncio.sleep(self.config.reset_timeout)
+            self.state = CircuitState.HALF_OPEN
+            try:
+                healthy = await self.probe()
+            except Exception as e:
+                log.debug(f"{self.name or 'Service'} probe failed: {e}")
+                healthy = False
+            if healthy:
+                self.record_success()
+            else:
+                self.state = CircuitState.OPEN
+                self.__opened_at = time.monotonic()
+
+    async def close(self):
+        if self.__probe_task is not None:
+            self.__probe_task.cancel()
+            try:
+                await self.__probe_task
+            except asyncio.CancelledError:
+                pass
+
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that guards requests with a `CircuitBreaker`.
+
+    With `probe_path`, recovery is checked in the background with a GET to
+    that path, sent with the credentials of the last failed request.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        breaker: CircuitBreaker,
+        probe_path: Optional[str] = None,
+    ):
+        self.__transport = transport
+        self.breaker = breaker
+        self.probe_path = probe_path
+        self.__last_failed: Optional[httpx.Request] = None
+        if probe_path:
+            breaker.probe = self._probe
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.breaker.before_request()
+        try:
+            response = await self.__transport.handle_async_request(request)
+        except httpx.TransportError:
+            self.__last_failed = request
+            self.breaker.record_failure()
+            raise
+        if response.status_code in FAILURE_STATUS_CODES:
+            self.__last_failed = request
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    async def _probe(self) -> bool:
+        if self.__last_failed is None or self.probe_path is None:
+            return False
+        request = httpx.Request(
+            "GET",
+            self.__last_failed.url.copy_with(path=self.probe_path, query=None),
+            headers=[
+                (name, value)
+                for name, value in self.__last_failed.headers.multi_items()
+                if name.lower() in _PROBE_HEADERS
+            ],
+        )
+        response = await self.__transport.handle_async_request(request)
+        await response.aclose()
+        return response.status_code < 500
+
+    async def aclose(self) -> None:
+        await self.breaker.close()
+        await self.__transport.aclose()
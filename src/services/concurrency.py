@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+from pydantic import BaseModel, Field
+
+log = logging.getLogger(__name__)
+
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+class ConcurrencyConfig(BaseModel):
+    initial_limit: int = Field(8, ge=1)
+    min_limit: int = Field(1, ge=1)
+    max_limit: int = Field(64, ge=1)
+    backoff_ratio: float = Field(
+        0.5, gt=0, lt=1, description="Limit multiplier on throttling"
+    )
+    latency_tolerance: float = Field(
+        2.0, gt=1, description="Latency spike threshold, as a multiple of baseline"
+    )
+    max_retry_after: float = Field(
+        60.0, ge=0, description="Cap on honoured Retry-After, in seconds"
+    )
+
+
+class LimiterStats(BaseModel):
+    limit: float
+    in_flight: int = 0
+    requests: int = 0
+    increases: int = 0
+    decreases: int = 0
+    throttled: int = 0
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on the number of requests in flight to one server.
+
+    Every successful request with normal latency raises the limit by
+    `1 / limit`, i.e. by about one per round trip. A 429/503 or a response
+    slower than `latency_tolerance` times the smoothed baseline multiplies
+    it by `backoff_ratio`, at most once per baseline latency so a burst of
+    rejections from one overload only counts once. A `Retry-After` header
+    on a throttled response pauses all new requests until it has passed.
+    """
+
+    def __init__(self, config: Optional[ConcurrencyConfig] = None, name: str = ""):
+        self.config = config or ConcurrencyConfig()
+        self.name = name
+        self.stats = LimiterStats(limit=self.config.initial_limit)
+        self.__baseline: Optional[float] = None
+        self.__last_decrease = 0.0
+        self.__resume_at = 0.0
+        self.__condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self.stats.limit)
+
+    async def acquire(self):
+        while (delay := self.__resume_at - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        async with self.__condition:
+            await self.__condition.wait_for(lambda: self.stats.in_flight < self.limit)
+            self.stats.in_flight += 1
+            self.stats.requests += 1
+
+    async def release(
+        self, latency: Optional[float] = None, response: Optional[httpx.Response] = None
+    ):
+        async with self.__condition:
+            self.stats.in_flight -= 1
+            if response is not None and latency is not None:
+                self._adjust(latency, response)
+            self.__condition.notify_all()
+
+    def _adjust(self, latency: float, response: httpx.Response):
+        throttled = response.status_code in THROTTLE_STATUS_CODES
+        spike = (
+            self.__baseline is not None
+            and latency > self.__baseline * self.config.latency_tolerance
+        )
+        if throttled:
+            self.stats.throttled += 1
+            retry_after = retry_after_seconds(response)
+            if retry_after is not None:
+                retry_after = min(retry_after, self.config.max_retry_after)
+                self.__resume_at = max(self.__resume_at, time.monotonic() + retry_after)
+                log.warning(
+                    f"{self.name or 'Server'} asked to retry after {retry_after:.1f}s."
+                )
+        # Spikes are folded in too, so a lasting slowdown becomes the new
+        # baseline instead of pinning the limit at `min_limit`.
+        self.__baseline = (
+            latency
+            if self.__baseline is None
+            else 0.9 * self.__baseline + 0.1 * latency
+        )
+        if throttled or spike:
+            self._decrease(latency, "throttled" if throttled else "latency spike")
+            return
+        if self.stats.limit < self.config.max_limit:
+            self.stats.limit = min(
+                self.config.max_limit, self.stats.limit + 1 / self.stats.limit
+            )
+            self.stats.increases += 1
+
+    def _decrease(self, latency: float, reason: str):
+        now = time.monotonic()
+        if now - self.__last_decrease < (self.__baseline or latency):
+            return
+        self.__last_decrease = now
+        self.stats.limit = max(
+            self.config.min_limit, self.stats.limit * self.config.backoff_ratio
+        )
+        self.stats.decreases += 1
+        log.info(
+            f"{self.name or 'Server'} {reason}: concurrency limit lowered to "
+            f"{self.limit}."
+        )
+
+
+class LimitedTransport(httpx.AsyncBaseTransport):
+    """Transport that routes every request through an `AdaptiveLimiter`."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: AdaptiveLimiter):
+        self.__transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = await self.__transport.handle_async_request(request)
+        except BaseException:
+            await self.limiter.release()
+            raise
+        await self.limiter.release(time.monotonic() - started, response)
+        return response
+
+    async def aclose(self) -> None:
+        await self.__transport.aclose()
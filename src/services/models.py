@@ -1,7 +1,35 @@
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
 from pydantic import BaseModel
 
-from src.services.salt.models import SaltAPIResponse
+from src.services.salt.models import MinionGrainsResponse
+
+
+class SourceStatus(str, Enum):
+    OK = "ok"
+    FAILED = "failed"
+    TIMEOUT = "timeout"
+
+
+class SourceResult(BaseModel):
+    status: SourceStatus
+    seconds: float
+    error: Optional[str] = None
 
 
 class ServicesResponses(BaseModel):
-    salt: SaltAPIResponse
+    salt: Optional[MinionGrainsResponse] = None
+    netbox_devices: Optional[List[Any]] = None
+    netbox_vms: Optional[List[Any]] = None
+    netbox_ips: Optional[List[Any]] = None
+    extra: Dict[str, Any] = {}
+    sources: Dict[str, SourceResult] = {}
+
+    @property
+    def failed_sources(self) -> List[str]:
+        return [
+            name
+            for name, result in self.sources.items()
+            if result.status != SourceStatus.OK
+        ]
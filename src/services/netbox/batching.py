@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+from src.services.netbox.exceptions import NetBoxAPIError
+
+log = logging.getLogger(__name__)
+
+
+class BatchLoader:
+    """
+    Coalesces individual lookups into batched list requests.
+
+    Every `load()` issued within the same event-loop tick is collected and
+    deduplicated, then resolved with one call to `fetch_many` per chunk of up to
+    `max_batch_size` keys. `fetch_many` returns a dict of the objects it found;
+    callers whose key is missing get a 404 `NetBoxAPIError`.
+    """
+
+    def __init__(
+        self,
+        fetch_many: Callable[[List[Any]], Awaitable[Dict[Any, Any]]],
+        not_found_message: str = "Object not found",
+        max_batch_size: int = 100,
+    ):
+        self.__fetch_many = fetch_many
+        self.not_found_message = not_found_message
+        self.max_batch_size = max_batch_size
+        self.__pending: Dict[Hashable, asyncio.Future] = {}
+        self.__tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: Hashable) -> Any:
+        future = self.__pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self.__pending:
+                loop.call_soon(self._dispatch)
+            future = loop.create_future()
+            self.__pending[key] = future
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        pending, self.__pending = self.__pending, {}
+        keys = list(pending)
+        log.debug(f"Dispatching {len(keys)} coalesced lookups")
+        for start in range(0, len(keys), self.max_batch_size):
+            batch = {
+                key: pending[key] for key in keys[start : start + self.max_batch_size]
+            }
+            task = asyncio.create_task(self._resolve(batch))
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+
+    async def _resolve(self, batch: Dict[Hashable, asyncio.Future]):
+        try:
+            found = await self.__fetch_many(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in batch.items():
+            if future.done():
+                continue
+            if key in found:
+                future.set_result(found[key])
+            else:
+                future.set_exception(
+                    NetBoxAPIError(self.not_found_message, status_code=404)
+                )
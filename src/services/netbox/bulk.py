@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+from pydantic import BaseModel, Field
+
+from src.services.netbox.exceptions import NetBoxAPIError
+from src.services.netbox.validation import ResponseDecoder
+
+log = logging.getLogger(__name__)
+
+
+class BulkConfig(BaseModel):
+    batch_size: int = Field(100, ge=1)
+    max_concurrency: int = Field(4, ge=1)
+
+
+class BulkFailure(BaseModel):
+    index: int = Field(..., description="Position of the object in the input")
+    object_id: Optional[int] = None
+    error: str
+    status_code: Optional[int] = None
+
+
+class BulkResult(BaseModel):
+    succeeded: List[Any] = []
+    failed: List[BulkFailure] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+async def run_bulk(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    payloads: List[Dict[str, Any]],
+    config: BulkConfig,
+    decoder: Optional[ResponseDecoder] = None,
+) -> BulkResult:
+    """
+    Sends `payloads` to a NetBox collection URL as list bodies.
+
+    Payloads are split into chunks of `config.batch_size` which are sent
+    concurrently, at most `config.max_concurrency` at a time. NetBox applies
+    each bulk request atomically, so when a chunk is rejected every object in
+    it is reported as failed with the error NetBox returned. Successful chunks
+    contribute the decoded objects, or the payload ids when `decoder` is None
+    (bulk DELETE returns no body). Authentication errors abort the whole run.
+    """
+    semaphore = asyncio.Semaphore(config.max_concurrency)
+    chunks = [
+        (start, payloads[start : start + config.batch_size])
+        for start in range(0, len(payloads), config.batch_size)
+    ]
+
+    async def send_chunk(start: int, chunk: List[Dict[str, Any]]) -> BulkResult:
+        async with semaphore:
+            log.debug(f"Bulk {method} {url}: objects {start}-{start + len(chunk) - 1}")
+            try:
+                response = await client.request(method, url, json=chunk)
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code in [401, 403]:
+                    raise NetBoxAPIError(
+                        "Authentication failed",
+                        status_code=e.response.status_code,
+                        response_text=e.response.text,
+                    ) from e
+                return _failed_chunk(
+                    start, chunk, e.response.text, e.response.status_code
+                )
+            except httpx.RequestError as e:
+                return _failed_chunk(start, chunk, str(e))
+        if decoder is None:
+            return BulkResult(succeeded=[payload.get("id") for payload in chunk])
+        return BulkResult(succeeded=decoder.decode(response.content))
+
+    results = await asyncio.gather(
+        *(send_chunk(start, chunk) for start, chunk in chunks),
+        return_exceptions=True,
+    )
+    bulk_result = BulkResult()
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+        bulk_result.succeeded.extend(result.succeeded)
+        bulk_result.failed.extend(result.failed)
+
+    log.info(
+        f"Bulk {method} {url}: {len(bulk_result.succeeded)} succeeded, "
+        f"{len(bulk_result.failed)} failed."
+    )
+    return bulk_result
+
+
+def _failed_chunk(
+    start: int,
+    chunk: List[Dict[str, Any]],
+    error: str,
+    status_code: Optional[int] = None,
+) -> BulkResult:
+    return BulkResult(
+        failed=[
+            BulkFailure(
+                index=start + offset,
+                object_id=payload.get("id"),
+                error=error,
+                status_code=status_code,
+            )
+            for offset, payload in enumerate(chunk)
+        ]
+    )
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+log = logging.getLogger(__name__)
+
+
+class CacheConfig(BaseModel):
+    max_size: int = Field(10000, ge=1, description="Entries kept per endpoint")
+    default_ttl: float = Field(300.0, gt=0, description="Seconds")
+    ttl: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Per-endpoint TTL overrides, keyed by client attribute name",
+    )
+
+    def create(self, endpoint: str) -> "TTLCache":
+        return TTLCache(self.max_size, self.ttl.get(endpoint, self.default_ttl))
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache with a fixed TTL and single-flight fetching.
+
+    Concurrent `get_or_fetch` calls for a key that is not cached share one
+    in-flight fetch. `invalidate` drops the entry and makes any fetch already
+    in flight for that key skip storing its (possibly stale) result. A key's
+    generation is only kept while fetches for it are running.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.__entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self.__in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.__generations: Dict[Hashable, int] = {}
+        self.__running: Dict[Hashable, int] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self.__entries[key]
+            self.stats.expirations += 1
+            return None
+        self.__entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self.__entries[key] = (time.monotonic() + self.ttl, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        if key in self.__running:
+            self.__generations[key] = self.__generations.get(key, 0) + 1
+        if self.__entries.pop(key, None) is not None:
+            self.stats.invalidations += 1
+        self.__in_flight.pop(key, None)
+
+    async def get_or_fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        value = self.get(key)
+        if value is not None:
+            self.stats.hits += 1
+            return value
+
+        task = self.__in_flight.get(key)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            generation = self.__generations.get(key, 0)
+            self.__running[key] = self.__running.get(key, 0) + 1
+            task = asyncio.create_task(self._fetch(key, fetch, generation))
+            task.add_done_callback(partial(self._fetch_done, key))
+            self.__in_flight[key] = task
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]], generation: int
+    ) -> Any:
+        try:
+            value = await fetch()
+        finally:
+            if self.__generations.get(key, 0) == generation:
+                self.__in_flight.pop(key, None)
+        if self.__generations.get(key, 0) == generation:
+            self.set(key, value)
+        return value
+
+    def _fetch_done(self, key: Hashable, task: asyncio.Task):
+        # Fetches orphaned by `invalidate` may outlive the one that replaced
+        # them, so the generation is only dropped with the last of them.
+        self.__running[key] -= 1
+        if not self.__running[key]:
+            del self.__running[key]
+            self.__generations.pop(key, None)
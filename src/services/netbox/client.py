@@ -1,29 +1,134 @@
 import logging
+from functools import partial
+from pathlib import Path
+from typing import Dict, Optional
 
-import httpx
-
+from src.services.circuit import CircuitBreaker
+from src.services.concurrency import AdaptiveLimiter
+from src.services.netbox.bulk import BulkConfig
+from src.services.netbox.cache import CacheConfig, CacheStats
 from src.services.netbox.endpoints.dcim import DevicesEndpoints
 from src.services.netbox.endpoints.ipam import IPAddressesEndpoints
 from src.services.netbox.endpoints.virtualization import VMEndpoints
+from src.services.netbox.pagination import PaginationConfig
+from src.services.netbox.response_cache import ResponseCacheTransport
+from src.services.netbox.validation import ValidationMode
+from src.services.retry import RetryBudget
+from src.services.transport import HTTPConfig, create_client
 
 log = logging.getLogger(__name__)
 
 
 class NetBoxAPIClient:
-    def __init__(self, base_url: str, token: str, verify_ssl: bool = True):
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        verify_ssl: bool = True,
+        pagination: Optional[PaginationConfig] = None,
+        validation: ValidationMode = ValidationMode.STRICT,
+        bulk: Optional[BulkConfig] = None,
+        batch_gets: bool = False,
+        cache: Optional[CacheConfig] = None,
+        response_cache_dir: Optional[Path] = None,
+        http: Optional[HTTPConfig] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        retry_budget: Optional[RetryBudget] = None,
+    ):
+        """
+        Initializes the client.
+
+        `validation` controls how responses are turned into objects: STRICT
+        validates every field, TRUSTED still coerces types but skips field
+        constraints and keeps URLs and datetimes as strings, and RAW yields
+        plain dicts. TRUSTED objects are instances of the model classes even
+        though their AnyUrl and AwareDatetime fields hold str, so do not
+        rely on those fields' declared types in that mode. `bulk` sets the
+        batch size and concurrency of the `bulk_*` methods. With
+        `batch_gets`, `get()` calls made in the same event-loop tick are
+        resolved with a single list request. `cache` enables an in-memory
+        cache in front of `get()`; entries are dropped when this client
+        updates, overwrites or deletes the object. With `response_cache_dir`,
+        GET responses are stored on disk and revalidated with conditional
+        requests, so unchanged pages are not downloaded again; their bodies
+        are still parsed. `http` sets the connection pool, timeouts and
+        protocol options. Requests from all endpoints
+        share `limiter`, which defaults to one built from `http.concurrency`
+        when that is set.
+        Idempotent requests are retried per `http.retry`, drawing on
+        `retry_budget`, which can be shared with other clients.
+        """
         headers = {
             "Authorization": f"Token {token}",
             "Accept": "application/json",
         }
-        self.__client = httpx.AsyncClient(
+        http = http or HTTPConfig(timeout=20.0)
+        if limiter is None and http.concurrency:
+            limiter = AdaptiveLimiter(http.concurrency, name="NetBox")
+        self.limiter = limiter
+        self.breaker = (
+            CircuitBreaker(http.circuit_breaker, name="NetBox")
+            if http.circuit_breaker
+            else None
+        )
+        self.__client = create_client(
+            http,
             base_url=base_url,
-            headers=headers,
-            timeout=20.0,
             verify=verify_ssl,
+            headers=headers,
+            limiter=limiter,
+            retry_budget=retry_budget,
+            breaker=self.breaker,
+            probe_path="/api/status/",
+            name="NetBox",
+            wrap_transport=(
+                partial(ResponseCacheTransport, cache_dir=response_cache_dir)
+                if response_cache_dir
+                else None
+            ),
+        )
+        self.__validation = validation
+        pagination = pagination or PaginationConfig()
+        bulk = bulk or BulkConfig()
+        # Each endpoint gets its own copy so the mode can be switched per endpoint.
+        self.devices = DevicesEndpoints(
+            self.__client,
+            pagination.model_copy(),
+            validation,
+            bulk,
+            batch_gets,
+            cache.create("devices") if cache else None,
         )
-        self.devices = DevicesEndpoints(self.__client)
-        self.vms = VMEndpoints(self.__client)
-        self.ips = IPAddressesEndpoints(self.__client)
+        self.vms = VMEndpoints(
+            self.__client,
+            pagination.model_copy(),
+            validation,
+            bulk,
+            batch_gets,
+            cache.create("vms") if cache else None,
+        )
+        self.ips = IPAddressesEndpoints(
+            self.__client,
+            pagination.model_copy(),
+            validation,
+            bulk,
+            batch_gets,
+            cache.create("ips") if cache else None,
+        )
+
+    @property
+    def validation(self) -> ValidationMode:
+        """Mode the endpoints decode responses with."""
+        return self.__validation
+
+    @property
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        endpoints = {"devices": self.devices, "vms": self.vms, "ips": self.ips}
+        return {
+            name: endpoint.cache_stats
+            for name, endpoint in endpoints.items()
+            if endpoint.cache_stats is not None
+        }
 
     async def __aenter__(self):
         return self
@@ -1,38 +1,120 @@
 import logging
-from typing import AsyncGenerator, Optional
+from functools import partial
+from typing import AsyncGenerator, Dict, List, Optional, Union
 
 import httpx
+from pydantic import TypeAdapter
 
+from src.services.netbox.batching import BatchLoader
+from src.services.netbox.bulk import BulkConfig, BulkResult, run_bulk
+from src.services.netbox.cache import CacheStats, TTLCache
 from src.services.netbox.exceptions import NetBoxAPIError
 from src.services.netbox.models import (
+    BRIEF_DEVICE_PAGE_ADAPTER,
+    DEVICE_ADAPTER,
+    DEVICE_LIST_ADAPTER,
+    DEVICE_PAGE_ADAPTER,
+    BriefDevice,
     Device,
+    ListFilter,
+    PaginatedBriefDeviceList,
     PaginatedDeviceList,
     PatchedDevice,
     WritableDevice,
 )
+from src.services.netbox.pagination import (
+    PaginationConfig,
+    PaginationMode,
+    Paginator,
+    list_params,
+)
+from src.services.netbox.validation import (
+    ResponseDecoder,
+    ValidationMode,
+    object_id,
+    projected_page_model,
+)
 
 log = logging.getLogger(__name__)
 
 
 class DevicesEndpoints:
-    def __init__(self, client: httpx.AsyncClient):
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        pagination: Optional[PaginationConfig] = None,
+        validation: ValidationMode = ValidationMode.STRICT,
+        bulk: Optional[BulkConfig] = None,
+        batch_gets: bool = False,
+        cache: Optional[TTLCache] = None,
+    ):
         self.__client = client
+        self.__cache = cache
+        self.__loader: Optional[BatchLoader] = None
+        if batch_gets:
+            self.__loader = BatchLoader(self._get_many, "Device not found")
+        self.bulk = bulk or BulkConfig()
+        self.__list_decoder = ResponseDecoder(
+            Device, DEVICE_LIST_ADAPTER, validation, many=True
+        )
+        self.__decoder = ResponseDecoder(Device, DEVICE_ADAPTER, validation)
+        self.pagination = pagination or PaginationConfig()
+        self.__paginator = Paginator(
+            client,
+            "/api/dcim/devices/",
+            ResponseDecoder(PaginatedDeviceList, DEVICE_PAGE_ADAPTER, validation),
+            self.pagination,
+        )
+        self.pagination_stats = self.__paginator.stats
+        # Batched gets have their own paginator, so they neither count towards
+        # `pagination_stats` nor inherit list()'s mode and prefetching.
+        self.__get_paginator = Paginator(
+            client,
+            self.__paginator.path,
+            self.__paginator.page_decoder,
+            PaginationConfig(page_size=self.pagination.page_size),
+        )
+        self.__brief_page_decoder = ResponseDecoder(
+            PaginatedBriefDeviceList, BRIEF_DEVICE_PAGE_ADAPTER, validation
+        )
+        projected_page = projected_page_model(PaginatedDeviceList, Device)
+        self.__projected_page_decoder = ResponseDecoder(
+            projected_page, TypeAdapter(projected_page), validation
+        )
 
-    async def list(self) -> AsyncGenerator[Device, None]:
-        next_url: Optional[str] = "/api/dcim/devices/"
-        try:
-            while next_url:
-                log.debug(f"Next URL: {next_url}")
-                response = await self.__client.get(next_url)
-                response.raise_for_status()
-                device_list = PaginatedDeviceList.model_validate(response.json())
+    @property
+    def cursor(self) -> Optional[int]:
+        """Last id consumed by a keyset `list()`, usable to resume it."""
+        return self.__paginator.cursor
+
+    async def list(
+        self,
+        mode: Optional[PaginationMode] = None,
+        cursor: Optional[int] = None,
+        filters: Optional[ListFilter] = None,
+        fields: Optional[List[str]] = None,
+        brief: bool = False,
+    ) -> AsyncGenerator[Union[Device, BriefDevice], None]:
+        """
+        Streams objects, optionally filtered server-side by `filters`.
 
+        `brief=True` requests NetBox's brief representation and yields
+        `BriefDevice` objects. `fields` limits the response to the given fields;
+        the yielded objects are `Device` subclasses with the other fields
+        left as None.
+        """
+        params = list_params(filters, fields, brief)
+        page_decoder = None
+        if brief:
+            page_decoder = self.__brief_page_decoder
+        elif fields:
+            page_decoder = self.__projected_page_decoder
+        try:
+            async for device_list in self.__paginator.pages(
+                mode, cursor, params, page_decoder
+            ):
                 for device in device_list.results:
                     yield device
-                if device_list.next:
-                    next_url = str(device_list.next)
-                else:
-                    next_url = None
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise NetBoxAPIError(
@@ -53,13 +135,39 @@ class DevicesEndpoints:
                     response_text=e.response.text,
                 ) from e
 
+    async def _get_many(self, device_ids: List[int]) -> Dict[int, Device]:
+        found = {}
+        params = {"id": device_ids}
+        async for device_list in self.__get_paginator.pages(params=params):
+            for device in device_list.results:
+                found[object_id(device)] = device
+        return found
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self.__cache.stats if self.__cache else None
+
+    def _invalidate(self, *device_ids: int):
+        if self.__cache:
+            for device_id in device_ids:
+                self.__cache.invalidate(int(device_id))
+
     async def get(self, device_id) -> Device:
+        if self.__cache:
+            return await self.__cache.get_or_fetch(
+                int(device_id), partial(self._get, device_id)
+            )
+        return await self._get(device_id)
+
+    async def _get(self, device_id) -> Device:
         url: str = f"/api/dcim/devices/{device_id}/"
         log.debug(f"Device URL: {url}")
         try:
+            if self.__loader:
+                return await self.__loader.load(int(device_id))
             response = await self.__client.get(url)
             response.raise_for_status()
-            return Device.model_validate(response.json())
+            return self.__decoder.decode(response.content)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise NetBoxAPIError(
@@ -88,7 +196,7 @@ class DevicesEndpoints:
             response.raise_for_status()
             if response.status_code == 201:
                 log.info("Device created successfully (Status: 201 Created).")
-                return Device.model_validate(response.json())
+                return self.__decoder.decode(response.content)
             else:
                 raise Exception(
                     f"Warning: API returned an unexpected success code: {response.status_code}"
@@ -118,8 +226,9 @@ class DevicesEndpoints:
         payload = device.model_dump(exclude_unset=True)
         try:
             response = await self.__client.put(url, json=payload)
+            self._invalidate(device_id)
             response.raise_for_status()
-            return Device.model_validate(response.json())
+            return self.__decoder.decode(response.content)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise NetBoxAPIError(
@@ -145,8 +254,9 @@ class DevicesEndpoints:
         payload = device.model_dump(exclude_unset=True)
         try:
             response = await self.__client.patch(url, json=payload)
+            self._invalidate(device_id)
             response.raise_for_status()
-            return Device.model_validate(response.json())
+            return self.__decoder.decode(response.content)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise NetBoxAPIError(
@@ -171,6 +281,7 @@ class DevicesEndpoints:
         url: str = f"/api/dcim/devices/{device_id}/"
         try:
             response = await self.__client.delete(url)
+            self._invalidate(device_id)
             response.raise_for_status()
             return response.status_code == 204
         except httpx.HTTPStatusError as e:
@@ -192,3 +303,31 @@ class DevicesEndpoints:
                     status_code=e.response.status_code,
                     response_text=e.response.text,
                 ) from e
+
+    async def bulk_create_devices(self, devices: List[WritableDevice]) -> BulkResult:
+        url: str = "/api/dcim/devices/"
+        payloads = [device.model_dump(exclude_unset=True) for device in devices]
+        return await run_bulk(
+            self.__client, "POST", url, payloads, self.bulk, self.__list_decoder
+        )
+
+    async def bulk_update_devices(
+        self, devices: Dict[int, PatchedDevice]
+    ) -> BulkResult:
+        url: str = "/api/dcim/devices/"
+        payloads = [
+            {**device.model_dump(exclude_unset=True), "id": device_id}
+            for device_id, device in devices.items()
+        ]
+        result = await run_bulk(
+            self.__client, "PATCH", url, payloads, self.bulk, self.__list_decoder
+        )
+        self._invalidate(*devices)
+        return result
+
+    async def bulk_delete_devices(self, device_ids: List[int]) -> BulkResult:
+        url: str = "/api/dcim/devices/"
+        payloads = [{"id": device_id} for device_id in device_ids]
+        result = await run_bulk(self.__client, "DELETE", url, payloads, self.bulk)
+        self._invalidate(*device_ids)
+        return result
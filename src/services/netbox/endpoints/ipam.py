@@ -1,38 +1,122 @@
 import logging
-from typing import AsyncGenerator, Optional
+from functools import partial
+from typing import AsyncGenerator, Dict, List, Optional, Union
 
 import httpx
+from pydantic import TypeAdapter
 
+from src.services.netbox.batching import BatchLoader
+from src.services.netbox.bulk import BulkConfig, BulkResult, run_bulk
+from src.services.netbox.cache import CacheStats, TTLCache
 from src.services.netbox.exceptions import NetBoxAPIError
 from src.services.netbox.models import (
+    BRIEF_IP_ADDRESS_PAGE_ADAPTER,
+    IP_ADDRESS_ADAPTER,
+    IP_ADDRESS_LIST_ADAPTER,
+    IP_ADDRESS_PAGE_ADAPTER,
+    BriefIPAddress,
     IPAddress,
+    ListFilter,
+    PaginatedBriefIPAddressList,
     PaginatedIPAddressList,
     PatchedIPAddress,
     WritableIPAddress,
 )
+from src.services.netbox.pagination import (
+    PaginationConfig,
+    PaginationMode,
+    Paginator,
+    list_params,
+)
+from src.services.netbox.validation import (
+    ResponseDecoder,
+    ValidationMode,
+    object_id,
+    projected_page_model,
+)
 
 log = logging.getLogger(__name__)
 
 
 class IPAddressesEndpoints:
-    def __init__(self, client: httpx.AsyncClient):
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        pagination: Optional[PaginationConfig] = None,
+        validation: ValidationMode = ValidationMode.STRICT,
+        bulk: Optional[BulkConfig] = None,
+        batch_gets: bool = False,
+        cache: Optional[TTLCache] = None,
+    ):
         self.__client = client
+        self.__cache = cache
+        self.__loader: Optional[BatchLoader] = None
+        if batch_gets:
+            self.__loader = BatchLoader(self._get_many, "IP address not found")
+        self.bulk = bulk or BulkConfig()
+        self.__list_decoder = ResponseDecoder(
+            IPAddress, IP_ADDRESS_LIST_ADAPTER, validation, many=True
+        )
+        self.__decoder = ResponseDecoder(IPAddress, IP_ADDRESS_ADAPTER, validation)
+        self.pagination = pagination or PaginationConfig()
+        self.__paginator = Paginator(
+            client,
+            "/api/ipam/ip-addresses/",
+            ResponseDecoder(
+                PaginatedIPAddressList, IP_ADDRESS_PAGE_ADAPTER, validation
+            ),
+            self.pagination,
+        )
+        self.pagination_stats = self.__paginator.stats
+        # Batched gets have their own paginator, so they neither count towards
+        # `pagination_stats` nor inherit list()'s mode and prefetching.
+        self.__get_paginator = Paginator(
+            client,
+            self.__paginator.path,
+            self.__paginator.page_decoder,
+            PaginationConfig(page_size=self.pagination.page_size),
+        )
+        self.__brief_page_decoder = ResponseDecoder(
+            PaginatedBriefIPAddressList, BRIEF_IP_ADDRESS_PAGE_ADAPTER, validation
+        )
+        projected_page = projected_page_model(PaginatedIPAddressList, IPAddress)
+        self.__projected_page_decoder = ResponseDecoder(
+            projected_page, TypeAdapter(projected_page), validation
+        )
 
-    async def list(self) -> AsyncGenerator[IPAddress, None]:
-        next_url: Optional[str] = "/api/ipam/ip-addresses/"
-        try:
-            while next_url:
-                log.debug(f"Next URL: {next_url}")
-                response = await self.__client.get(next_url)
-                response.raise_for_status()
-                ip_address_list = PaginatedIPAddressList.model_validate(response.json())
+    @property
+    def cursor(self) -> Optional[int]:
+        """Last id consumed by a keyset `list()`, usable to resume it."""
+        return self.__paginator.cursor
+
+    async def list(
+        self,
+        mode: Optional[PaginationMode] = None,
+        cursor: Optional[int] = None,
+        filters: Optional[ListFilter] = None,
+        fields: Optional[List[str]] = None,
+        brief: bool = False,
+    ) -> AsyncGenerator[Union[IPAddress, BriefIPAddress], None]:
+        """
+        Streams objects, optionally filtered server-side by `filters`.
 
+        `brief=True` requests NetBox's brief representation and yields
+        `BriefIPAddress` objects. `fields` limits the response to the given fields;
+        the yielded objects are `IPAddress` subclasses with the other fields
+        left as None.
+        """
+        params = list_params(filters, fields, brief)
+        page_decoder = None
+        if brief:
+            page_decoder = self.__brief_page_decoder
+        elif fields:
+            page_decoder = self.__projected_page_decoder
+        try:
+            async for ip_address_list in self.__paginator.pages(
+                mode, cursor, params, page_decoder
+            ):
                 for ip_address in ip_address_list.results:
                     yield ip_address
-                if ip_address_list.next:
-                    next_url = str(ip_address_list.next)
-                else:
-                    next_url = None
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise NetBoxAPIError(
@@ -53,12 +137,38 @@ class IPAddressesEndpoints:
                     response_text=e.response.text,
                 ) from e
 
+    async def _get_many(self, ip_address_ids: List[int]) -> Dict[int, IPAddress]:
+        found = {}
+        params = {"id": ip_address_ids}
+        async for ip_address_list in self.__get_paginator.pages(params=params):
+            for ip_address in ip_address_list.results:
+                found[object_id(ip_address)] = ip_address
+        return found
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self.__cache.stats if self.__cache else None
+
+    def _invalidate(self, *ip_address_ids: int):
+        if self.__cache:
+            for ip_address_id in ip_address_ids:
+                self.__cache.invalidate(int(ip_address_id))
+
     async def get(self, ip_address_id) -> IPAddress:
+        if self.__cache:
+            return await self.__cache.get_or_fetch(
+                int(ip_address_id), partial(self._get, ip_address_id)
+            )
+        return await self._get(ip_address_id)
+
+    async def _get(self, ip_address_id) -> IPAddress:
         url: str = f"/api/ipam/ip-addresses/{ip_address_id}/"
         try:
+            if self.__loader:
+                return await self.__loader.load(int(ip_address_id))
             response = await self.__client.get(url)
             response.raise_for_status()
-            return IPAddress.model_validate(response.json())
+            return self.__decoder.decode(response.content)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise NetBoxAPIError(
@@ -89,7 +199,7 @@ class IPAddressesEndpoints:
             response.raise_for_status()
             if response.status_code == 201:
                 log.info("IP Address created successfully (Status: 201 Created).")
-                return IPAddress.model_validate(response.json())
+                return self.__decoder.decode(response.content)
             else:
                 raise Exception(
                     f"Warning: API returned an unexpected success code: {response.status_code}"
@@ -121,8 +231,9 @@ class IPAddressesEndpoints:
         payload = ip_address.model_dump(exclude_unset=True)
         try:
             response = await self.__client.put(url, json=payload)
+            self._invalidate(ip_address_id)
             response.raise_for_status()
-            return IPAddress.model_validate(response.json())
+            return self.__decoder.decode(response.content)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise NetBoxAPIError(
@@ -150,8 +261,9 @@ class IPAddressesEndpoints:
         payload = ip_address.model_dump(exclude_unset=True)
         try:
             response = await self.__client.patch(url, json=payload)
+            self._invalidate(ip_address_id)
             response.raise_for_status()
-            return IPAddress.model_validate(response.json())
+            return self.__decoder.decode(response.content)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise NetBoxAPIError(
@@ -176,6 +288,7 @@ class IPAddressesEndpoints:
         url: str = f"/api/ipam/ip-addresses/{ip_address_id}/"
         try:
             response = await self.__client.delete(url)
+            self._invalidate(ip_address_id)
             response.raise_for_status()
             return response.status_code == 204
         except httpx.HTTPStatusError as e:
@@ -197,3 +310,35 @@ class IPAddressesEndpoints:
                     status_code=e.response.status_code,
                     response_text=e.response.text,
                 ) from e
+
+    async def bulk_create_ip_addresses(
+        self, ip_addresses: List[WritableIPAddress]
+    ) -> BulkResult:
+        url: str = "/api/ipam/ip-addresses/"
+        payloads = [
+            ip_address.model_dump(exclude_unset=True) for ip_address in ip_addresses
+        ]
+        return await run_bulk(
+            self.__client, "POST", url, payloads, self.bulk, self.__list_decoder
+        )
+
+    async def bulk_update_ip_addresses(
+        self, ip_addresses: Dict[int, PatchedIPAddress]
+    ) -> BulkResult:
+        url: str = "/api/ipam/ip-addresses/"
+        payloads = [
+            {**ip_address.model_dump(exclude_unset=True), "id": ip_address_id}
+            for ip_address_id, ip_address in ip_addresses.items()
+        ]
+        result = await run_bulk(
+            self.__client, "PATCH", url, payloads, self.bulk, self.__list_decoder
+        )
+        self._invalidate(*ip_addresses)
+        return result
+
+    async def bulk_delete_ip_addresses(self, ip_address_ids: List[int]) -> BulkResult:
+        url: str = "/api/ipam/ip-addresses/"
+        payloads = [{"id": ip_address_id} for ip_address_id in ip_address_ids]
+        result = await run_bulk(self.__client, "DELETE", url, payloads, self.bulk)
+        self._invalidate(*ip_address_ids)
+        return result
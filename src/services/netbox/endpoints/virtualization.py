@@ -1,38 +1,128 @@
 import logging
-from typing import AsyncGenerator, Optional
+from functools import partial
+from typing import AsyncGenerator, Dict, List, Optional, Union
 
 import httpx
+from pydantic import TypeAdapter
 
+from src.services.netbox.batching import BatchLoader
+from src.services.netbox.bulk import BulkConfig, BulkResult, run_bulk
+from src.services.netbox.cache import CacheStats, TTLCache
 from src.services.netbox.exceptions import NetBoxAPIError
 from src.services.netbox.models import (
+    BRIEF_VIRTUAL_MACHINE_PAGE_ADAPTER,
+    VIRTUAL_MACHINE_ADAPTER,
+    VIRTUAL_MACHINE_LIST_ADAPTER,
+    VIRTUAL_MACHINE_PAGE_ADAPTER,
+    BriefVirtualMachine,
+    ListFilter,
+    PaginatedBriefVirtualMachineList,
     PaginatedVirtualMachineList,
     PatchedVirtualMachine,
     VirtualMachine,
     WritableVirtualMachine,
 )
+from src.services.netbox.pagination import (
+    PaginationConfig,
+    PaginationMode,
+    Paginator,
+    list_params,
+)
+from src.services.netbox.validation import (
+    ResponseDecoder,
+    ValidationMode,
+    object_id,
+    projected_page_model,
+)
 
 log = logging.getLogger(__name__)
 
 
 class VMEndpoints:
-    def __init__(self, client: httpx.AsyncClient):
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        pagination: Optional[PaginationConfig] = None,
+        validation: ValidationMode = ValidationMode.STRICT,
+        bulk: Optional[BulkConfig] = None,
+        batch_gets: bool = False,
+        cache: Optional[TTLCache] = None,
+    ):
         self.__client = client
+        self.__cache = cache
+        self.__loader: Optional[BatchLoader] = None
+        if batch_gets:
+            self.__loader = BatchLoader(self._get_many, "Virtual Machine not found")
+        self.bulk = bulk or BulkConfig()
+        self.__list_decoder = ResponseDecoder(
+            VirtualMachine, VIRTUAL_MACHINE_LIST_ADAPTER, validation, many=True
+        )
+        self.__decoder = ResponseDecoder(
+            VirtualMachine, VIRTUAL_MACHINE_ADAPTER, validation
+        )
+        self.pagination = pagination or PaginationConfig()
+        self.__paginator = Paginator(
+            client,
+            "/api/virtualization/virtual-machines/",
+            ResponseDecoder(
+                PaginatedVirtualMachineList, VIRTUAL_MACHINE_PAGE_ADAPTER, validation
+            ),
+            self.pagination,
+        )
+        self.pagination_stats = self.__paginator.stats
+        # Batched gets have their own paginator, so they neither count towards
+        # `pagination_stats` nor inherit list()'s mode and prefetching.
+        self.__get_paginator = Paginator(
+            client,
+            self.__paginator.path,
+            self.__paginator.page_decoder,
+            PaginationConfig(page_size=self.pagination.page_size),
+        )
+        self.__brief_page_decoder = ResponseDecoder(
+            PaginatedBriefVirtualMachineList,
+            BRIEF_VIRTUAL_MACHINE_PAGE_ADAPTER,
+            validation,
+        )
+        projected_page = projected_page_model(
+            PaginatedVirtualMachineList, VirtualMachine
+        )
+        self.__projected_page_decoder = ResponseDecoder(
+            projected_page, TypeAdapter(projected_page), validation
+        )
 
-    async def list(self) -> AsyncGenerator[VirtualMachine, None]:
-        next_url: Optional[str] = "/api/virtualization/virtual-machines/"
-        try:
-            while next_url:
-                log.debug(f"Next URL: {next_url}")
-                response = await self.__client.get(next_url)
-                response.raise_for_status()
-                vm_list = PaginatedVirtualMachineList.model_validate(response.json())
+    @property
+    def cursor(self) -> Optional[int]:
+        """Last id consumed by a keyset `list()`, usable to resume it."""
+        return self.__paginator.cursor
+
+    async def list(
+        self,
+        mode: Optional[PaginationMode] = None,
+        cursor: Optional[int] = None,
+        filters: Optional[ListFilter] = None,
+        fields: Optional[List[str]] = None,
+        brief: bool = False,
+    ) -> AsyncGenerator[Union[VirtualMachine, BriefVirtualMachine], None]:
+        """
+        Streams objects, optionally filtered server-side by `filters`.
 
+        `brief=True` requests NetBox's brief representation and yields
+        `BriefVirtualMachine` objects. `fields` limits the response to the
+        given fields; the yielded objects are `VirtualMachine` subclasses with
+        the other fields left as None.
+        """
+        params = list_params(filters, fields, brief)
+        page_decoder = None
+        if brief:
+            page_decoder = self.__brief_page_decoder
+        elif fields:
+            page_decoder = self.__projected_page_decoder
+        try:
+            async for vm_list in self.__paginator.pages(
+                mode, cursor, params, page_decoder
+            ):
                 for vm in vm_list.results:
                     yield vm
-                if vm_list.next:
-                    next_url = str(vm_list.next)
-                else:
-                    next_url = None
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise NetBoxAPIError(
@@ -53,13 +143,39 @@ class VMEndpoints:
                     response_text=e.response.text,
                 ) from e
 
+    async def _get_many(self, vm_ids: List[int]) -> Dict[int, VirtualMachine]:
+        found = {}
+        params = {"id": vm_ids}
+        async for vm_list in self.__get_paginator.pages(params=params):
+            for vm in vm_list.results:
+                found[object_id(vm)] = vm
+        return found
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self.__cache.stats if self.__cache else None
+
+    def _invalidate(self, *vm_ids: int):
+        if self.__cache:
+            for vm_id in vm_ids:
+                self.__cache.invalidate(int(vm_id))
+
     async def get(self, vm_id) -> VirtualMachine:
+        if self.__cache:
+            return await self.__cache.get_or_fetch(
+                int(vm_id), partial(self._get, vm_id)
+            )
+        return await self._get(vm_id)
+
+    async def _get(self, vm_id) -> VirtualMachine:
         url: str = f"/api/virtualization/virtual-machines/{vm_id}/"
         log.debug(f"Virtual Machine URL: {url}")
         try:
+            if self.__loader:
+                return await self.__loader.load(int(vm_id))
             response = await self.__client.get(url)
             response.raise_for_status()
-            return VirtualMachine.model_validate(response.json())
+            return self.__decoder.decode(response.content)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise NetBoxAPIError(
@@ -90,7 +206,7 @@ class VMEndpoints:
             response.raise_for_status()
             if response.status_code == 201:
                 log.info("VM created successfully (Status: 201 Created).")
-                return VirtualMachine.model_validate(response.json())
+                return self.__decoder.decode(response.content)
             else:
                 raise Exception(
                     f"Warning: API returned an unexpected success code: {response.status_code}"
@@ -122,8 +238,9 @@ class VMEndpoints:
         payload = virtual_machine.model_dump(exclude_unset=True)
         try:
             response = await self.__client.put(url, json=payload)
+            self._invalidate(vm_id)
             response.raise_for_status()
-            return VirtualMachine.model_validate(response.json())
+            return self.__decoder.decode(response.content)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise NetBoxAPIError(
@@ -151,8 +268,9 @@ class VMEndpoints:
         payload = virtual_machine.model_dump(exclude_unset=True)
         try:
             response = await self.__client.patch(url, json=payload)
+            self._invalidate(vm_id)
             response.raise_for_status()
-            return VirtualMachine.model_validate(response.json())
+            return self.__decoder.decode(response.content)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise NetBoxAPIError(
@@ -177,6 +295,7 @@ class VMEndpoints:
         url: str = f"/api/virtualization/virtual-machines/{vm_id}/"
         try:
             response = await self.__client.delete(url)
+            self._invalidate(vm_id)
             response.raise_for_status()
             return response.status_code == 204
         except httpx.HTTPStatusError as e:
@@ -198,3 +317,31 @@ class VMEndpoints:
                     status_code=e.response.status_code,
                     response_text=e.response.text,
                 ) from e
+
+    async def bulk_create_vms(self, vms: List[WritableVirtualMachine]) -> BulkResult:
+        url: str = "/api/virtualization/virtual-machines/"
+        payloads = [vm.model_dump(exclude_unset=True) for vm in vms]
+        return await run_bulk(
+            self.__client, "POST", url, payloads, self.bulk, self.__list_decoder
+        )
+
+    async def bulk_update_vms(
+        self, vms: Dict[int, PatchedVirtualMachine]
+    ) -> BulkResult:
+        url: str = "/api/virtualization/virtual-machines/"
+        payloads = [
+            {**vm.model_dump(exclude_unset=True), "id": vm_id}
+            for vm_id, vm in vms.items()
+        ]
+        result = await run_bulk(
+            self.__client, "PATCH", url, payloads, self.bulk, self.__list_decoder
+        )
+        self._invalidate(*vms)
+        return result
+
+    async def bulk_delete_vms(self, vm_ids: List[int]) -> BulkResult:
+        url: str = "/api/virtualization/virtual-machines/"
+        payloads = [{"id": vm_id} for vm_id in vm_ids]
+        result = await run_bulk(self.__client, "DELETE", url, payloads, self.bulk)
+        self._invalidate(*vm_ids)
+        return result
@@ -1,5 +1,6 @@
+from datetime import datetime
 from enum import Enum
-from typing import Any, Optional, Union
+from typing import Any, Dict, Optional, Union
 
 from pydantic import (
     AnyUrl,
@@ -7,6 +8,7 @@ from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    TypeAdapter,
     confloat,
     conint,
     constr,
@@ -217,6 +219,15 @@ class BriefDevice(BaseModel):
     description: Optional[constr(max_length=200)] = None
 
 
+class BriefVirtualMachine(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: int
+    url: AnyUrl
+    display: str
+    name: constr(max_length=64)
+    description: Optional[constr(max_length=200)] = None
+
+
 class BriefVRF(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: int
@@ -343,6 +354,75 @@ class PaginatedVirtualMachineList(BaseModel):
     results: list[VirtualMachine]
 
 
+class PaginatedBriefDeviceList(BaseModel):
+    count: int = Field(..., examples=[123])
+    next: Optional[AnyUrl] = Field(
+        None, examples=["http://api.example.org/accounts/?offset=400&limit=100"]
+    )
+    previous: Optional[AnyUrl] = Field(
+        None, examples=["http://api.example.org/accounts/?offset=200&limit=100"]
+    )
+    results: list[BriefDevice]
+
+
+class PaginatedBriefIPAddressList(BaseModel):
+    count: int = Field(..., examples=[123])
+    next: Optional[AnyUrl] = Field(
+        None, examples=["http://api.example.org/accounts/?offset=400&limit=100"]
+    )
+    previous: Optional[AnyUrl] = Field(
+        None, examples=["http://api.example.org/accounts/?offset=200&limit=100"]
+    )
+    results: list[BriefIPAddress]
+
+
+class PaginatedBriefVirtualMachineList(BaseModel):
+    count: int = Field(..., examples=[123])
+    next: Optional[AnyUrl] = Field(
+        None, examples=["http://api.example.org/accounts/?offset=400&limit=100"]
+    )
+    previous: Optional[AnyUrl] = Field(
+        None, examples=["http://api.example.org/accounts/?offset=200&limit=100"]
+    )
+    results: list[BriefVirtualMachine]
+
+
+# --- Filter Models ---
+
+
+class ListFilter(BaseModel):
+    """Query filters shared by the NetBox list endpoints."""
+
+    site: Optional[Union[str, list[str]]] = Field(None, description="Site slug")
+    tenant: Optional[Union[str, list[str]]] = Field(None, description="Tenant slug")
+    status: Optional[Union[str, list[str]]] = None
+    tag: Optional[Union[str, list[str]]] = Field(None, description="Tag slug")
+    role: Optional[Union[str, list[str]]] = Field(None, description="Role slug")
+    q: Optional[str] = Field(None, description="Free-text search")
+    last_updated__gte: Optional[datetime] = None
+
+    def to_params(self) -> Dict[str, Any]:
+        return self.model_dump(mode="json", exclude_none=True)
+
+
+# --- Type Adapters ---
+# Built once at import time so endpoints can validate raw response bytes
+# without rebuilding validators or going through `response.json()`.
+
+DEVICE_ADAPTER = TypeAdapter(Device)
+IP_ADDRESS_ADAPTER = TypeAdapter(IPAddress)
+VIRTUAL_MACHINE_ADAPTER = TypeAdapter(VirtualMachine)
+DEVICE_PAGE_ADAPTER = TypeAdapter(PaginatedDeviceList)
+IP_ADDRESS_PAGE_ADAPTER = TypeAdapter(PaginatedIPAddressList)
+VIRTUAL_MACHINE_PAGE_ADAPTER = TypeAdapter(PaginatedVirtualMachineList)
+DEVICE_LIST_ADAPTER = TypeAdapter(list[Device])
+IP_ADDRESS_LIST_ADAPTER = TypeAdapter(list[IPAddress])
+VIRTUAL_MACHINE_LIST_ADAPTER = TypeAdapter(list[VirtualMachine])
+BRIEF_DEVICE_PAGE_ADAPTER = TypeAdapter(PaginatedBriefDeviceList)
+BRIEF_IP_ADDRESS_PAGE_ADAPTER = TypeAdapter(PaginatedBriefIPAddressList)
+BRIEF_VIRTUAL_MACHINE_PAGE_ADAPTER = TypeAdapter(PaginatedBriefVirtualMachineList)
+
+
 # --- Writable and Request Models ---
 
 
@@ -0,0 +1,135 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import httpx
+from pydantic import BaseModel
+
+log = logging.getLogger(__name__)
+
+# The stored body is already decoded, so transfer-level headers must not be
+# replayed with it.
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class ResponseCacheStats(BaseModel):
+    revalidated: int = 0
+    stored: int = 0
+    uncacheable: int = 0
+
+
+class CachedResponse(BaseModel):
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    headers: List[Tuple[str, str]] = []
+
+
+class ResponseCacheTransport(httpx.AsyncBaseTransport):
+    """
+    Persistent HTTP cache for GET requests, wrapping another transport.
+
+    Successful responses that carry an `ETag` or `Last-Modified` header are
+    stored under `cache_dir`. Later requests for the same URL, including ones
+    made by a new process, are sent with `If-None-Match`/`If-Modified-Since`;
+    on 304 the stored body is returned as a normal 200 response, which saves
+    the download but is still parsed by the caller.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache_dir: Path):
+        self.__transport = transport
+        self.cache_dir = cache_dir
+        self.stats = ResponseCacheStats()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self.__transport.handle_async_request(request)
+
+        key = hashlib.sha256(str(request.url).encode()).hexdigest()
+        cached = self._load(key)
+        if cached is not None:
+            meta, body = cached
+            if meta.etag:
+                request.headers["If-None-Match"] = meta.etag
+            if meta.last_modified:
+                request.headers["If-Modified-Since"] = meta.last_modified
+
+        response = await self.__transport.handle_async_request(request)
+
+        if response.status_code == 304 and cached is not None:
+            await response.aclose()
+            self.stats.revalidated += 1
+            log.debug(f"Not modified, serving cached body: {request.url}")
+            return httpx.Response(
+                200,
+                headers=meta.headers,
+                content=body,
+                request=request,
+                extensions=response.extensions,
+            )
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if (
+            response.status_code != 200
+            or not (etag or last_modified)
+            or "no-store" in response.headers.get("Cache-Control", "")
+        ):
+            self.stats.uncacheable += 1
+            return response
+
+        body = await response.aread()
+        meta = CachedResponse(
+            url=str(request.url),
+            etag=etag,
+            last_modified=last_modified,
+            headers=[
+                (name, value)
+                for name, value in response.headers.multi_items()
+                if name.lower() not in _DROPPED_HEADERS
+            ],
+        )
+        self._store(key, meta, body)
+        self.stats.stored += 1
+        return httpx.Response(
+            200,
+            headers=meta.headers,
+            content=body,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        log.info(
+            f"Response cache: {self.stats.revalidated} revalidated, "
+            f"{self.stats.stored} stored."
+        )
+        await self.__transport.aclose()
+
+    def _load(self, key: str) -> Optional[Tuple[CachedResponse, bytes]]:
+        try:
+            with open(self.cache_dir / f"{key}.json", "rb") as file:
+                meta = CachedResponse.model_validate_json(file.read())
+            with open(self.cache_dir / f"{key}.body", "rb") as file:
+                return meta, file.read()
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            log.warning(f"Discarding unreadable cache entry {key}: {e}")
+            return None
+
+    def _store(self, key: str, meta: CachedResponse, body: bytes) -> None:
+        # Body first: an interrupted write leaves the old validator in place,
+        # which at worst costs a full download on the next request.
+        for suffix, data in (
+            (".body", body),
+            (".json", meta.model_dump_json().encode()),
+        ):
+            path = self.cache_dir / f"{key}{suffix}"
+            tmp_path = path.with_suffix(suffix + ".tmp")
+            with open(tmp_path, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
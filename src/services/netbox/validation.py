@@ -0,0 +1,132 @@
+import types
+from enum import Enum
+from functools import cache
+from typing import Annotated, Any, Optional, Union, get_args, get_origin
+
+from pydantic import AnyUrl, AwareDatetime, BaseModel, Field, TypeAdapter, create_model
+from pydantic_core import from_json
+
+
+class ValidationMode(str, Enum):
+    STRICT = "strict"
+    # Instances pass `isinstance` checks against the strict models, but their
+    # AnyUrl and AwareDatetime fields hold the raw str, see `trusted_model`.
+    TRUSTED = "trusted"
+    RAW = "raw"
+
+
+def _relax(annotation: Any) -> Any:
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _relax(get_args(annotation)[0])
+    if origin in (Union, types.UnionType):
+        return Union[tuple(_relax(arg) for arg in get_args(annotation))]
+    if origin is list:
+        return list[_relax(get_args(annotation)[0])]
+    if annotation in (AnyUrl, AwareDatetime):
+        return str
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return trusted_model(annotation)
+    return annotation
+
+
+@cache
+def trusted_model(model: type[BaseModel]) -> type[BaseModel]:
+    """
+    Returns a subclass of `model` for data that comes from a trusted source.
+
+    URLs and datetimes are kept as the strings NetBox sent, `constr`/`conint`
+    constraints (patterns, lengths, ranges) are dropped, and nested models are
+    replaced by their trusted variants. Types are still coerced by
+    pydantic-core, so this is much cheaper than building the models with
+    `model_construct` in Python while instances remain `isinstance(obj, model)`.
+    Code that relies on the declared types must not assume them for these
+    fields: `obj.url` is a str rather than an `AnyUrl` and `obj.created` a str
+    rather than a `datetime`.
+    """
+    fields = {}
+    for name, field in model.model_fields.items():
+        if field.is_required():
+            default = ...
+        elif field.default_factory is not None:
+            default = Field(default_factory=field.default_factory)
+        else:
+            default = field.default
+        fields[name] = (_relax(field.annotation), default)
+    return create_model(f"Trusted{model.__name__}", __base__=model, **fields)
+
+
+@cache
+def projected_model(model: type[BaseModel]) -> type[BaseModel]:
+    """
+    Returns a subclass of `model` with every field optional, for responses
+    requested with a `fields=` projection that only carry some of them.
+    """
+    fields = {}
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        if field.metadata:
+            annotation = Annotated[annotation, *field.metadata]
+        fields[name] = (Optional[annotation], None)
+    return create_model(f"Projected{model.__name__}", __base__=model, **fields)
+
+
+@cache
+def projected_page_model(
+    page_model: type[BaseModel], item_model: type[BaseModel]
+) -> type[BaseModel]:
+    return create_model(
+        f"Projected{page_model.__name__}",
+        __base__=page_model,
+        results=(list[projected_model(item_model)], ...),
+    )
+
+
+@cache
+def _trusted_adapter(model: type[BaseModel], many: bool = False) -> TypeAdapter:
+    if many:
+        return TypeAdapter(list[trusted_model(model)])
+    return TypeAdapter(trusted_model(model))
+
+
+def object_id(obj: Any) -> int:
+    if isinstance(obj, dict):
+        return obj["id"]
+    return obj.id
+
+
+class ResponseDecoder:
+    """
+    Decodes NetBox response bodies according to the validation mode.
+
+    STRICT validates the raw bytes with `adapter`. TRUSTED decodes into the
+    `trusted_model` variant of `model`. RAW returns plain dicts, except for
+    paginated responses where the page wrapper is still a `model` instance so
+    `count`, `next` and `results` can be read as attributes.
+
+    With `many=True` the body is a JSON list of `model` objects, as returned by
+    the bulk endpoints, and `adapter` must validate such a list.
+    """
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        adapter: TypeAdapter,
+        mode: ValidationMode = ValidationMode.STRICT,
+        many: bool = False,
+    ):
+        self.model = model
+        self.mode = mode
+        self.__paginated = not many and "results" in model.model_fields
+        if mode == ValidationMode.TRUSTED:
+            self.adapter = _trusted_adapter(model, many)
+        else:
+            self.adapter = adapter
+
+    def decode(self, content: bytes) -> Any:
+        if self.mode == ValidationMode.RAW:
+            data = from_json(content)
+            if self.__paginated:
+                return self.model.model_construct(**data)
+            return data
+        return self.adapter.validate_json(content)
@@ -0,0 +1,161 @@
+import logging
+import re
+from collections import Counter
+from typing import Set
+
+import httpx
+from pydantic import BaseModel, Field
+from tenacity import AsyncRetrying, RetryCallState, wait_random_exponential
+
+from src.services.circuit import CircuitOpenError
+from src.services.concurrency import retry_after_seconds
+
+log = logging.getLogger(__name__)
+
+DEFAULT_RETRY_BUDGET = 100
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class RetryConfig(BaseModel):
+    max_attempts: int = Field(4, ge=1, description="Including the first attempt")
+    initial_wait: float = Field(0.5, gt=0, description="Seconds")
+    max_wait: float = Field(10.0, gt=0, description="Seconds, before jitter")
+    max_retry_after: float = Field(
+        60.0, ge=0, description="Cap on honoured Retry-After, in seconds"
+    )
+    status_codes: Set[int] = {429, 502, 503, 504}
+    retry_non_idempotent: bool = Field(
+        False, description="Also retry POST and PATCH requests"
+    )
+
+
+class RetryBudget:
+    """Number of retries all clients sharing it may still make in this run."""
+
+    def __init__(self, max_retries: int):
+        self.max_retries = max_retries
+        self.used = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.used >= self.max_retries
+
+    def consume(self) -> bool:
+        if self.exhausted:
+            return False
+        self.used += 1
+        return True
+
+
+def endpoint_name(request: httpx.Request) -> str:
+    """`GET /api/dcim/devices/12/` -> `GET /api/dcim/devices/{id}/`"""
+    return f"{request.method} {_ID_SEGMENT.sub('/{id}', request.url.path)}"
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """
+    Retries failed requests with exponential backoff and full jitter.
+
+    Connection errors, timeouts and responses with one of
+    `config.status_codes` are retried, for idempotent methods only unless
+    `config.retry_non_idempotent` is set, but not requests rejected by an open
+    circuit breaker. A `Retry-After` header extends the
+    wait. Each retry takes one unit from `budget`; once it is exhausted the
+    last error or response is returned as-is, so a failing server cannot
+    cause a retry storm across the run.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        config: RetryConfig,
+        budget: RetryBudget,
+        name: str = "",
+    ):
+        self.__transport = transport
+        self.config = config
+        self.budget = budget
+        self.name = name
+        self.retries: Counter[str] = Counter()
+        self.__budget_warned = False
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if (
+            request.method not in IDEMPOTENT_METHODS
+            and not self.config.retry_non_idempotent
+        ):
+            return await self.__transport.handle_async_request(request)
+
+        retrying = AsyncRetrying(
+            retry=self._should_retry,
+            wait=self._wait,
+            before_sleep=self._before_sleep,
+            reraise=True,
+        )
+        return await retrying(self.__transport.handle_async_request, request)
+
+    def _should_retry(self, state: RetryCallState) -> bool:
+        outcome = state.outcome
+        if outcome is None:
+            return False
+        if outcome.failed:
+            exception = outcome.exception()
+            if not isinstance(exception, httpx.TransportError) or isinstance(
+                exception, CircuitOpenError
+            ):
+                return False
+        elif outcome.result().status_code not in self.config.status_codes:
+            return False
+        if state.attempt_number >= self.config.max_attempts:
+            return False
+        if not self.budget.consume():
+            if not self.__budget_warned:
+                log.warning(
+                    f"Retry budget of {self.budget.max_retries} exhausted, "
+                    "failing without retrying."
+                )
+                self.__budget_warned = True
+            return False
+        return True
+
+    def _wait(self, state: RetryCallState) -> float:
+        wait = wait_random_exponential(
+            multiplier=self.config.initial_wait, max=self.config.max_wait
+        )(state)
+        outcome = state.outcome
+        if outcome is not None and not outcome.failed:
+            retry_after = retry_after_seconds(outcome.result())
+            if retry_after is not None:
+                wait = max(wait, min(retry_after, self.config.max_retry_after))
+        return wait
+
+    async def _before_sleep(self, state: RetryCallState):
+        request: httpx.Request = state.args[0]
+        endpoint = endpoint_name(request)
+        self.retries[endpoint] += 1
+        outcome = state.outcome
+        if outcome is None:
+            return
+        if outcome.failed:
+            reason = type(outcome.exception()).__name__
+        else:
+            response = outcome.result()
+            reason = str(response.status_code)
+            await response.aclose()
+        wait = state.next_action.sleep if state.next_action else 0
+        log.warning(
+            f"{self.name or 'Request'} {endpoint} failed with {reason}, retrying "
+            f"in {wait:.1f}s (attempt {state.attempt_number + 1}/"
+            f"{self.config.max_attempts})."
+        )
+
+    async def aclose(self) -> None:
+        if self.retries:
+            counts = ", ".join(
+                f"{endpoint}: {count}" for endpoint, count in self.retries.most_common()
+            )
+            log.info(f"{self.name or 'HTTP'} retries per endpoint: {counts}")
+        await self.__transport.aclose()
@@ -0,0 +1,15 @@
+from typing import List, Sequence
+
+from pydantic import BaseModel, Field
+
+
+class BatchConfig(BaseModel):
+    batch_size: int = Field(500, ge=1, description="Minions per sub-job")
+    max_concurrency: int = Field(4, ge=1, description="Sub-jobs running at once")
+
+
+def split_batches(minions: Sequence[str], batch_size: int) -> List[List[str]]:
+    return [
+        list(minions[start : start + batch_size])
+        for start in range(0, len(minions), batch_size)
+    ]
@@ -1,27 +1,81 @@
 import asyncio
 import logging
+import time
+from functools import partial
 from typing import Any, Dict, List, Optional
 
 import httpx
 
+from src.services.circuit import CircuitBreaker
+from src.services.concurrency import AdaptiveLimiter
+from src.services.retry import RetryBudget
 from src.services.salt import exceptions, models
+from src.services.salt.batching import BatchConfig, split_batches
+from src.services.salt.events import SaltEventStream, SharedEventStream
+from src.services.salt.jobs import JobReturns, MinionReturnStream
+from src.services.salt.keys import (
+    LOCAL_TARGET_TYPES,
+    KeyCacheConfig,
+    KeySource,
+    MinionKeyCache,
+    expand_target,
+)
+from src.services.salt.master_cache import MasterCacheConfig, cache_ages
+from src.services.transport import HTTPConfig, create_client
 
 log = logging.getLogger(__name__)
 
 
 class SaltAPIClient:
-    def __init__(self, api_url: str, ssl_verify: bool = False):
+    def __init__(
+        self,
+        api_url: str,
+        ssl_verify: bool = False,
+        http: Optional[HTTPConfig] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        master_cache: Optional[MasterCacheConfig] = None,
+        key_cache: Optional[KeyCacheConfig] = None,
+    ):
         """
         Initializes the client.
 
+        `http` sets the connection pool, timeouts and protocol options.
+        Requests go through `limiter`, which defaults to one built from
+        `http.concurrency` when that is set. Idempotent requests, such as job
+        result lookups, are retried per `http.retry`, drawing on
+        `retry_budget`, which can be shared with other clients.
+        `master_cache` configures reads of grains from the master's cache.
+        With `key_cache`, the minion id list is cached and glob, list and
+        pcre targets are resolved locally against it.
+
         Note:
             For a fully authenticated instance, use the `create` classmethod.
         """
         self.api_url = api_url.rstrip("/")
-        self.__client = httpx.AsyncClient(
+        self.master_cache = master_cache or MasterCacheConfig()
+        self.key_source = key_cache.source if key_cache else KeySource.KEYS
+        self.keys = (
+            MinionKeyCache(key_cache.ttl, self._fetch_minion_ids) if key_cache else None
+        )
+        http = http or HTTPConfig()
+        if limiter is None and http.concurrency:
+            limiter = AdaptiveLimiter(http.concurrency, name="Salt API")
+        self.limiter = limiter
+        self.breaker = (
+            CircuitBreaker(http.circuit_breaker, name="Salt API")
+            if http.circuit_breaker
+            else None
+        )
+        self.__client = create_client(
+            http,
             base_url=self.api_url,
             verify=ssl_verify,
-            timeout=30.0,
+            limiter=limiter,
+            retry_budget=retry_budget,
+            breaker=self.breaker,
+            probe_path="/",
+            name="Salt API",
         )
         self.__token: Optional[str] = None
 
@@ -39,8 +93,15 @@ class SaltAPIClient:
         password: str,
         eauth: str = "pam",
         ssl_verify: bool = False,
+        http: Optional[HTTPConfig] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        master_cache: Optional[MasterCacheConfig] = None,
+        key_cache: Optional[KeyCacheConfig] = None,
     ):
-        instance = cls(api_url, ssl_verify)
+        instance = cls(
+            api_url, ssl_verify, http, limiter, retry_budget, master_cache, key_cache
+        )
         auth_payload = {
             "username": username,
             "password": password,
@@ -127,6 +188,43 @@ class SaltAPIClient:
                 response_text=e.response.text,
             ) from e
 
+    async def _run_runner(
+        self,
+        fun: str,
+        args: Optional[List[Any]] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        if not self.__token:
+            raise exceptions.SaltAPIError(
+                "Cannot run command without a valid login session."
+            )
+        # `/minions` only accepts local clients, runners are posted to `/`.
+        payload = [
+            {
+                "client": "runner",
+                "fun": fun,
+                "arg": args or [],
+                "kwarg": kwargs or {},
+            }
+        ]
+        log.debug(f"Running Salt runner: fun={fun}")
+        try:
+            response = await self.__client.post("/", json=payload)
+            response.raise_for_status()
+            return response.json()["return"][0]
+        except httpx.HTTPStatusError as e:
+            log.error(f"Salt runner '{fun}' failed", exc_info=True)
+            raise exceptions.SaltAPIError(
+                f"Runner '{fun}' failed",
+                status_code=e.response.status_code,
+                response_text=e.response.text,
+            ) from e
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise exceptions.SaltAPIError(
+                f"Could not parse result of runner '{fun}'",
+                response_text=response.text,
+            ) from e
+
     async def get_job_result(self, jid: str) -> Dict[str, Any]:
         log.debug(f"Fetching result for JID: {jid}")
         try:
@@ -141,6 +239,54 @@ class SaltAPIClient:
                 response_text=e.response.text,
             ) from e
 
+    async def _start_job(
+        self,
+        fun: str,
+        tgt: str,
+        tgt_type: str = "glob",
+        args: Optional[List[Any]] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+        timeout: float = 120,
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 10.0,
+        use_events: bool = True,
+    ) -> JobReturns:
+        # Subscribe before submitting, so no return can be published unseen.
+        events = await SaltEventStream.open(self.__client) if use_events else None
+        try:
+            job_submission_response = await self._run_job(
+                fun=fun,
+                tgt=tgt,
+                tgt_type=tgt_type,
+                args=args,
+                kwargs=kwargs,
+                client="local_async",
+            )
+            submission = job_submission_response["return"][0]
+            jid = submission["jid"]
+            log.info(f"Successfully submitted job. JID: {jid}")
+        except (KeyError, IndexError, TypeError):
+            if events is not None:
+                await events.aclose()
+            raise exceptions.SaltAPIError(
+                "Could not parse JID from Salt API response",
+                response_text=str(job_submission_response),
+            )
+        except BaseException:
+            if events is not None:
+                await events.aclose()
+            raise
+        minions = submission.get("minions")
+        return JobReturns(
+            jid,
+            self.get_job_result,
+            minions=set(minions) if minions is not None else None,
+            events=events,
+            timeout=timeout,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval,
+        )
+
     async def run_command(
         self,
         fun: str,
@@ -149,66 +295,473 @@ class SaltAPIClient:
         args: Optional[List[Any]] = None,
         kwargs: Optional[Dict[str, Any]] = None,
         timeout: int = 120,
-        poll_interval: float = 2.0,
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 10.0,
+        use_events: bool = True,
     ) -> Dict[str, Any]:
-        job_submission_response = await self._run_job(
+        """
+        Runs a job and waits for every targeted minion to return.
+
+        Returns are collected from the salt-api `/events` stream as they are
+        published. When the stream is unavailable, or `use_events` is False,
+        `/jobs/<jid>` is polled instead, starting at `poll_interval` and
+        backing off exponentially up to `max_poll_interval`.
+        """
+        job = await self._start_job(
             fun=fun,
             tgt=tgt,
             tgt_type=tgt_type,
             args=args,
             kwargs=kwargs,
-            client="local_async",
+            timeout=timeout,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval,
+            use_events=use_events,
         )
+        return await self._collect(job, timeout)
+
+    async def _collect(self, job: JobReturns, timeout: float) -> Dict[str, Any]:
+        return_block = {}
         try:
-            jid = job_submission_response["return"][0]["jid"]
-            log.info(f"Successfully submitted job. JID: {jid}")
-        except (KeyError, IndexError):
+            async for minion_id, value in job:
+                return_block[minion_id] = value
+        finally:
+            await job.aclose()
+
+        if job.timed_out:
             raise exceptions.SaltAPIError(
-                "Could not parse JID from Salt API response",
-                response_text=str(job_submission_response),
+                f"Job {job.jid} timed out after {timeout} seconds. "
+                f"{len(job.stragglers)} minions did not return."
             )
+        if not job.targeted:
+            log.warning(f"Job {job.jid} did not target any minions.")
+            return {}
+        log.info(
+            f"Job {job.jid} completed successfully. All {len(job.targeted)} minions have returned."
+        )
+        return return_block
 
-        total_wait_time = 0
-        while total_wait_time < timeout:
-            job_result = await self.get_job_result(jid)
-            info_block = job_result.get("info", [{}])[0]
-            return_block = job_result.get("return", [{}])[0]
+    async def run_many(
+        self,
+        calls: List[models.SaltCall],
+        tgt: str,
+        tgt_type: str = "glob",
+        timeout: int = 120,
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 10.0,
+        use_events: bool = True,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Runs several functions on the same target and waits for every
+        minion to return from each, keyed by function name.
 
-            targeted_minions = set(info_block.get("Minions", []))
-            if not targeted_minions:
-                log.warning(f"Job {jid} did not target any minions.")
-                return {}
+        All functions are submitted as lowstate chunks of a single request
+        and their returns are read from one shared `/events` stream, or
+        polled per job when it is unavailable. Raises if any job times out.
 
-            returned_minions = set(return_block.keys())
-            if targeted_minions.issubset(returned_minions):
-                log.info(
-                    f"Job {jid} completed successfully. All {len(targeted_minions)} minions have returned."
+        Example:
+            results = await client.run_many(
+                [
+                    models.SaltCall(fun="test.ping"),
+                    models.SaltCall(fun="pkg.version", args=["salt-minion"]),
+                ],
+                tgt="web*",
+            )
+            results["pkg.version"]["web1"]
+        """
+        funs = [call.fun for call in calls]
+        if len(set(funs)) != len(funs):
+            raise ValueError("run_many results are keyed by function, got duplicates")
+        if not self.__token:
+            raise exceptions.SaltAPIError(
+                "Cannot run command without a valid login session."
+            )
+        payload = [
+            {
+                "client": "local_async",
+                "tgt": tgt,
+                "fun": call.fun,
+                "tgt_type": tgt_type,
+                "arg": call.args,
+                "kwarg": call.kwargs,
+            }
+            for call in calls
+        ]
+        stream = await SaltEventStream.open(self.__client) if use_events else None
+        shared = SharedEventStream(stream) if stream is not None else None
+        log.debug(f"Submitting {len(calls)} Salt jobs: fun={funs}, tgt={tgt}")
+        try:
+            response = await self.__client.post("/minions", json=payload)
+            response.raise_for_status()
+            submissions = response.json()["return"]
+            jobs = [
+                JobReturns(
+                    submission["jid"],
+                    self.get_job_result,
+                    minions=(
+                        set(submission["minions"])
+                        if submission.get("minions") is not None
+                        else None
+                    ),
+                    events=shared.subscribe(submission["jid"]) if shared else None,
+                    timeout=timeout,
+                    poll_interval=poll_interval,
+                    max_poll_interval=max_poll_interval,
                 )
-                return return_block
-            log.debug(
-                f"Job {jid} running. Got {len(returned_minions)}/{len(targeted_minions)} results. Waiting..."
+                for submission in submissions
+            ]
+            if len(jobs) != len(calls):
+                raise exceptions.SaltAPIError(
+                    f"Submitted {len(calls)} jobs but got {len(jobs)} JIDs",
+                    response_text=response.text,
+                )
+            log.info(
+                f"Successfully submitted {len(jobs)} jobs. "
+                f"JIDs: {', '.join(job.jid for job in jobs)}"
+            )
+            outcomes = await asyncio.gather(
+                *(self._collect(job, timeout) for job in jobs),
+                return_exceptions=True,
             )
-            await asyncio.sleep(poll_interval)
-            total_wait_time += poll_interval
+        except httpx.HTTPStatusError as e:
+            log.error(f"Salt API commands {funs} failed", exc_info=True)
+            raise exceptions.SaltAPIError(
+                f"API commands {funs} failed",
+                status_code=e.response.status_code,
+                response_text=e.response.text,
+            ) from e
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise exceptions.SaltAPIError(
+                "Could not parse JIDs from Salt API response",
+                response_text=response.text,
+            ) from e
+        finally:
+            if shared is not None:
+                await shared.aclose()
+
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        return dict(zip(funs, outcomes))
 
-        raise exceptions.SaltAPIError(f"Job {jid} timed out after {timeout} seconds.")
+    @staticmethod
+    def _grains_call(grains: Optional[List[str]]) -> Dict[str, Any]:
+        # `grains.item` returns only the requested keys, a small fraction of
+        # the full `grains.items` payload. `default` makes grains a minion
+        # lacks come back as null rather than "", so the model default applies.
+        return {
+            "fun": "grains.item",
+            "args": list(models.GRAIN_KEYS if grains is None else grains),
+            "kwargs": {"default": None},
+        }
 
     async def get_minion_grains(
         self,
         target: str = "*",
         target_type: str = "glob",
+        grains: Optional[List[str]] = None,
+        timeout: int = 120,
+        use_events: bool = True,
+        from_cache: bool = False,
+        batch: Optional[BatchConfig] = None,
     ) -> models.MinionGrainsResponse:
+        """
+        Fetches `grains` from every targeted minion, by default the fields
+        declared on `models.Grains`.
+
+        With `from_cache`, grains are read from the master's cache instead,
+        see `get_cached_minion_grains`. With `batch`, the target is split
+        into sub-jobs, see `_get_minion_grains_batched`.
+        """
+        if from_cache:
+            cached = await self.get_cached_minion_grains(
+                target,
+                target_type,
+                grains=grains,
+                timeout=timeout,
+                use_events=use_events,
+                batch=batch,
+            )
+            return cached.to_grains()
+        if batch is not None:
+            return await self._get_minion_grains_batched(
+                target, target_type, batch, grains, timeout, use_events
+            )
         log.info(f"Fetching grains for target: {target}")
         response = await self.run_command(
-            fun="grains.items",
             tgt=target,
             tgt_type=target_type,
+            timeout=timeout,
+            use_events=use_events,
+            **self._grains_call(grains),
         )
         log.debug(f"Received grains response from Salt API: {response}")
         validated_response = models.MinionGrainsResponse.model_validate(response)
         log.info("Successfully fetched and validated grains.")
         return validated_response
 
+    async def _fetch_minion_ids(self) -> List[str]:
+        if self.key_source == KeySource.PRESENT:
+            present = await self._run_runner("manage.present")
+            if not isinstance(present, list):
+                raise exceptions.SaltAPIError(
+                    "Unexpected manage.present result",
+                    response_text=str(present)[:200],
+                )
+            return present
+        try:
+            response = await self.__client.get("/keys")
+            response.raise_for_status()
+            return response.json()["return"]["minions"]
+        except httpx.HTTPStatusError as e:
+            log.error("Failed to fetch minion keys", exc_info=True)
+            raise exceptions.SaltAPIError(
+                "Failed to fetch minion keys",
+                status_code=e.response.status_code,
+                response_text=e.response.text,
+            ) from e
+        except (KeyError, TypeError, ValueError) as e:
+            raise exceptions.SaltAPIError(
+                "Could not parse minion keys from Salt API response",
+                response_text=response.text,
+            ) from e
+
+    async def get_minion_ids(self, refresh: bool = False) -> List[str]:
+        """
+        Returns the accepted minion ids, or with `KeySource.PRESENT` the
+        connected ones, from the key cache when one is configured.
+        """
+        if self.keys is None:
+            return sorted(await self._fetch_minion_ids())
+        return await self.keys.get(refresh)
+
+    async def resolve_target(self, target: str, target_type: str = "glob") -> List[str]:
+        """
+        Returns the minions matching `target`.
+
+        With a key cache, glob, list and pcre targets are matched locally.
+        Otherwise the master resolves the target, which it only reports when
+        publishing a job, so `test.ping` is published without waiting for
+        its returns.
+        """
+        if self.keys is not None and target_type in LOCAL_TARGET_TYPES:
+            minions = expand_target(await self.keys.get(), target, target_type)
+            log.debug(f"Resolved {target} locally to {len(minions)} minions.")
+            return minions
+        response = await self._run_job(
+            fun="test.ping", tgt=target, tgt_type=target_type, client="local_async"
+        )
+        try:
+            submission = response["return"][0]
+            return sorted(submission["minions"]) if submission else []
+        except (KeyError, IndexError, TypeError) as e:
+            raise exceptions.SaltAPIError(
+                "Could not parse target minions from Salt API response",
+                response_text=str(response),
+            ) from e
+
+    async def _get_minion_grains_batched(
+        self,
+        target: str,
+        target_type: str,
+        batch: BatchConfig,
+        grains: Optional[List[str]],
+        timeout: float,
+        use_events: bool,
+    ) -> models.MinionGrainsResponse:
+        """
+        Resolves `target` to its minions and fetches their grains in batches,
+        see `_get_grains_in_batches`.
+        """
+        minions = await self.resolve_target(target, target_type)
+        return await self._get_grains_in_batches(
+            minions, batch, grains, timeout, use_events
+        )
+
+    async def _get_grains_in_batches(
+        self,
+        minions: List[str],
+        batch: BatchConfig,
+        grains: Optional[List[str]],
+        timeout: float,
+        use_events: bool,
+    ) -> models.MinionGrainsResponse:
+        """
+        Fetches the grains of `minions` in list targeted sub-jobs of
+        `batch.batch_size`, at most `batch.max_concurrency` at a time, each
+        with its own `timeout`.
+
+        A slow minion only delays its own batch. Minions that do not return
+        in time are logged and left out rather than failing the whole fetch.
+        """
+        batches = split_batches(minions, batch.batch_size)
+        log.info(
+            f"Fetching grains for {len(minions)} minions in {len(batches)} "
+            f"batches of up to {batch.batch_size}."
+        )
+        semaphore = asyncio.Semaphore(batch.max_concurrency)
+        results: Dict[str, models.Grains] = {}
+        stragglers: List[str] = []
+
+        async def run_batch(index: int, members: List[str]):
+            async with semaphore:
+                started = time.perf_counter()
+                stream = self.stream_minion_grains(
+                    ",".join(members),
+                    "list",
+                    timeout=timeout,
+                    use_events=use_events,
+                    grains=grains,
+                )
+                async for minion_id, minion_grains in stream:
+                    results[minion_id] = minion_grains
+            stragglers.extend(stream.stragglers)
+            log.info(
+                f"Batch {index}/{len(batches)}: "
+                f"{len(members) - len(stream.stragglers)}/{len(members)} minions "
+                f"returned in {time.perf_counter() - started:.2f}s, "
+                f"{len(results)}/{len(minions)} in total."
+            )
+
+        outcomes = await asyncio.gather(
+            *(run_batch(index, members) for index, members in enumerate(batches, 1)),
+            return_exceptions=True,
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+        if stragglers:
+            log.warning(
+                f"{len(stragglers)} of {len(minions)} minions did not return grains."
+            )
+        log.info(f"Fetched grains for {len(results)} minions.")
+        return models.MinionGrainsResponse(results)
+
+    def stream_minion_grains(
+        self,
+        target: str = "*",
+        target_type: str = "glob",
+        timeout: float = 120,
+        use_events: bool = True,
+        grains: Optional[List[str]] = None,
+    ) -> MinionReturnStream:
+        """
+        Yields `(minion_id, Grains)` as each targeted minion returns, so
+        processing can start before the slowest minion has answered.
+
+        Example:
+            stream = client.stream_minion_grains("web*")
+            async for minion_id, grains in stream:
+                ...
+            if stream.timed_out:
+                log.warning(f"No grains from {stream.stragglers}")
+        """
+        log.info(f"Streaming grains for target: {target}")
+        return MinionReturnStream(
+            partial(
+                self._start_job,
+                tgt=target,
+                tgt_type=target_type,
+                timeout=timeout,
+                use_events=use_events,
+                **self._grains_call(grains),
+            ),
+            models.Grains,
+        )
+
+    async def get_cached_minion_grains(
+        self,
+        target: str = "*",
+        target_type: str = "glob",
+        max_age: Optional[float] = None,
+        grains: Optional[List[str]] = None,
+        timeout: float = 120,
+        use_events: bool = True,
+        batch: Optional[BatchConfig] = None,
+    ) -> models.CachedGrainsResponse:
+        """
+        Reads grains from the master's cache with the `cache.grains` runner,
+        without waiting on any minion, and reports each entry's age.
+
+        Entries older than `max_age` (default `master_cache.max_age`) or of
+        unknown age are refreshed from the minions, unless
+        `master_cache.live_fallback` is off. Cached grains are always kept,
+        with their age or None if it is unknown, and only replaced by a live
+        return, so a minion that does not answer within `timeout` still has
+        its cached entry.
+        Minions the master has no cache entry for are only fetched when the
+        target can be resolved with the key cache. With `batch`, the live
+        fetch is split into sub-jobs, see `_get_grains_in_batches`.
+        """
+        max_age = self.master_cache.max_age if max_age is None else max_age
+        log.info(f"Reading cached grains for target: {target}")
+        # The cache itself carries no timestamps; the data file mtimes do.
+        cached, found = await asyncio.gather(
+            self._run_runner(
+                "cache.grains", kwargs={"tgt": target, "tgt_type": target_type}
+            ),
+            self._run_runner(
+                "salt.cmd",
+                args=["file.find", self.master_cache.cache_dir],
+                kwargs={"name": "data.p", "print": "path,mtime"},
+            ),
+        )
+        if not isinstance(cached, dict):
+            raise exceptions.SaltAPIError(
+                "Unexpected cache.grains result", response_text=str(cached)[:200]
+            )
+        ages = cache_ages(found, time.time())
+
+        results: Dict[str, models.CachedGrains] = {}
+        stale: List[str] = []
+        for minion_id, data in cached.items():
+            age = ages.get(minion_id)
+            if isinstance(data, dict) and data:
+                results[minion_id] = models.CachedGrains(
+                    grains=models.Grains.model_validate(data), age=age
+                )
+            if age is None or age > max_age or minion_id not in results:
+                stale.append(minion_id)
+        if self.keys is not None and target_type in LOCAL_TARGET_TYPES:
+            # With a key list, minions missing from the cache are known too.
+            expected = await self.resolve_target(target, target_type)
+            stale.extend(minion for minion in expected if minion not in cached)
+        log.info(
+            f"Master cache has grains for {len(cached)} minions, "
+            f"{len(stale)} stale, unknown or missing."
+        )
+
+        if stale and self.master_cache.live_fallback:
+            if batch is not None:
+                live = await self._get_grains_in_batches(
+                    stale, batch, grains, timeout, use_events
+                )
+                returned = live.root
+            else:
+                stream = self.stream_minion_grains(
+                    ",".join(stale),
+                    "list",
+                    timeout=timeout,
+                    use_events=use_events,
+                    grains=grains,
+                )
+                returned = {
+                    minion_id: minion_grains
+                    async for minion_id, minion_grains in stream
+                }
+            for minion_id, minion_grains in returned.items():
+                results[minion_id] = models.CachedGrains(
+                    grains=minion_grains, age=0.0, live=True
+                )
+            if len(returned) < len(stale):
+                log.warning(
+                    f"{len(stale) - len(returned)} minions with stale cache "
+                    f"entries did not return, keeping cached grains where "
+                    f"available."
+                )
+        return models.CachedGrainsResponse(results)
+
     # async def get_minion_grains(
     #     self,
     #     target: str = "*",
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+
+class SaltEventStream:
+    """
+    Reader for salt-api's `/events` server-sent-event stream.
+
+    The stream carries every event on the master bus, so it has to be
+    opened before a job is submitted for none of the job's events to be
+    missed. Use `open`, which returns None when the endpoint is unavailable.
+    """
+
+    def __init__(self, response: httpx.Response):
+        self.__response = response
+
+    @classmethod
+    async def open(cls, client: httpx.AsyncClient) -> Optional["SaltEventStream"]:
+        # The stream is idle between events, so only the connect timeout
+        # applies; callers bound the total wait themselves.
+        request = client.build_request(
+            "GET",
+            "/events",
+            headers={"Accept": "text/event-stream"},
+            timeout=httpx.Timeout(client.timeout.connect, read=None),
+        )
+        try:
+            response = await client.send(request, stream=True)
+        except httpx.RequestError as e:
+            log.info(f"Salt event stream unavailable: {e}")
+            return None
+        content_type = response.headers.get("Content-Type", "")
+        if response.status_code != 200 or not content_type.startswith(
+            "text/event-stream"
+        ):
+            log.info(
+                f"Salt event stream unavailable: {response.status_code} {content_type}"
+            )
+            await response.aclose()
+            return None
+        log.debug("Opened Salt event stream.")
+        return cls(response)
+
+    async def events(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yields `(tag, data)` for every event until the stream ends."""
+        data_lines = []
+        async for line in self.__response.aiter_lines():
+            if line.startswith("data:"):
+                data_lines.append(line[5:].strip())
+                continue
+            if line or not data_lines:
+                # `tag:` and `retry:` fields, comments and keep-alives.
+                continue
+            payload = "\n".join(data_lines)
+            data_lines = []
+            try:
+                event = json.loads(payload)
+            except json.JSONDecodeError:
+                log.debug(f"Skipping malformed Salt event: {payload[:200]}")
+                continue
+            if isinstance(event, dict) and "tag" in event:
+                yield event["tag"], event.get("data") or {}
+
+    async def aclose(self):
+        await self.__response.aclose()
+
+
+_END = object()
+
+
+class SharedEventStream:
+    """
+    Routes the events of one `SaltEventStream` to several jobs by JID.
+
+    Subscribe every job before iterating any subscription; reading starts
+    with the first iteration, and events of jobs not subscribed by then
+    are dropped. The stream is closed once every subscription is closed.
+    """
+
+    def __init__(self, stream: SaltEventStream):
+        self.__stream = stream
+        self.__queues: Dict[str, asyncio.Queue] = {}
+        self.__reader: Optional[asyncio.Task] = None
+
+    def subscribe(self, jid: str) -> "JobEventSubscription":
+        queue: asyncio.Queue = asyncio.Queue()
+        self.__queues[jid] = queue
+        return JobEventSubscription(self, jid, queue)
+
+    def _start(self):
+        if self.__reader is None:
+            self.__reader = asyncio.create_task(self._read())
+
+    async def _read(self):
+        end: object = _END
+        try:
+            async for tag, data in self.__stream.events():
+                parts = tag.split("/", 3)
+                if len(parts) > 2 and parts[:2] == ["salt", "job"]:
+                    queue = self.__queues.get(parts[2])
+                    if queue is not None:
+                        queue.put_nowait((tag, data))
+        except httpx.HTTPError as e:
+            end = e
+        for queue in self.__queues.values():
+            queue.put_nowait(end)
+
+    async def _unsubscribe(self, jid: str):
+        self.__queues.pop(jid, None)
+        if not self.__queues:
+            await self.aclose()
+
+    async def aclose(self):
+        if self.__reader is not None:
+            self.__reader.cancel()
+            try:
+                await self.__reader
+            except asyncio.CancelledError:
+                pass
+        await self.__stream.aclose()
+
+
+class JobEventSubscription:
+    """The events of one job on a `SharedEventStream`."""
+
+    def __init__(self, shared: SharedEventStream, jid: str, queue: asyncio.Queue):
+        self.__shared = shared
+        self.__jid = jid
+        self.__queue = queue
+        self.__closed = False
+
+    async def events(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        self.__shared._start()
+        while True:
+            item = await self.__queue.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    async def aclose(self):
+        if not self.__closed:
+            self.__closed = True
+            await self.__shared._unsubscribe(self.__jid)
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import httpx
+from pydantic import BaseModel, ValidationError
+
+from src.services.salt.events import JobEventSubscription, SaltEventStream
+
+log = logging.getLogger(__name__)
+
+
+class JobReturns:
+    """
+    Async iterator of `(minion_id, return)` pairs for one Salt job.
+
+    Returns are read from `events` when the event stream is available,
+    otherwise, or if the stream breaks, `/jobs/<jid>` is polled with
+    exponential backoff starting at `poll_interval`. Iteration ends once
+    every targeted minion has returned or `timeout` seconds have passed, in
+    which case `timed_out` is set and `stragglers` lists the missing minions.
+    """
+
+    def __init__(
+        self,
+        jid: str,
+        get_job_result: Callable[[str], Awaitable[Dict[str, Any]]],
+        minions: Optional[Set[str]] = None,
+        events: Optional[Union[SaltEventStream, JobEventSubscription]] = None,
+        timeout: float = 120,
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 10.0,
+    ):
+        self.jid = jid
+        self.targeted = minions
+        self.returned: Set[str] = set()
+        self.timed_out = False
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.__get_job_result = get_job_result
+        self.__events = events
+        self.__deadline: Optional[float] = None
+
+    @property
+    def complete(self) -> bool:
+        return self.targeted is not None and self.targeted <= self.returned
+
+    @property
+    def stragglers(self) -> List[str]:
+        return sorted((self.targeted or set()) - self.returned)
+
+    def __aiter__(self) -> AsyncIterator[Tuple[str, Any]]:
+        return self._iterate()
+
+    async def aclose(self):
+        if self.__events is not None:
+            await self.__events.aclose()
+            self.__events = None
+
+    def _remaining(self) -> float:
+        assert self.__deadline is not None
+        return self.__deadline - asyncio.get_running_loop().time()
+
+    async def _iterate(self) -> AsyncIterator[Tuple[str, Any]]:
+        self.__deadline = asyncio.get_running_loop().time() + self.timeout
+        try:
+            if self.__events is not None:
+                try:
+                    async for item in self._from_events(self.__events):
+                        yield item
+                except httpx.HTTPError as e:
+                    log.warning(f"Salt event stream failed for job {self.jid}: {e}")
+                if self.complete or self.timed_out:
+                    return
+                log.info(f"Falling back to polling for job {self.jid}.")
+                await self.aclose()
+            async for item in self._from_polling():
+                yield item
+        finally:
+            await self.aclose()
+
+    def _record(self, minion_id: str) -> bool:
+        if minion_id in self.returned:
+            return False
+        self.returned.add(minion_id)
+        return True
+
+    async def _from_events(
+        self, stream: Union[SaltEventStream, JobEventSubscription]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        prefix = f"salt/job/{self.jid}/"
+        events = stream.events()
+        while not self.complete:
+            try:
+                tag, data = await asyncio.wait_for(anext(events), self._remaining())
+            except TimeoutError:
+                self.timed_out = True
+                return
+            except StopAsyncIteration:
+                log.warning(f"Salt event stream ended before job {self.jid} finished.")
+                return
+            if not tag.startswith(prefix):
+                continue
+            if tag == f"{prefix}new":
+                if self.targeted is None:
+                    self.targeted = set(data.get("minions", []))
+            elif tag.startswith(f"{prefix}ret/"):
+                minion_id = data.get("id") or tag.rsplit("/", 1)[-1]
+                if self._record(minion_id):
+                    yield minion_id, data.get("return")
+
+    async def _from_polling(self) -> AsyncIterator[Tuple[str, Any]]:
+        interval = self.poll_interval
+        while True:
+            remaining = self._remaining()
+            if remaining <= 0:
+                self.timed_out = True
+                return
+            try:
+                job_result = await asyncio.wait_for(
+                    self.__get_job_result(self.jid), remaining
+                )
+            except TimeoutError:
+                self.timed_out = True
+                return
+            info_block = job_result.get("info", [{}])[0]
+            return_block = job_result.get("return", [{}])[0]
+            if self.targeted is None:
+                self.targeted = set(info_block.get("Minions", []))
+            for minion_id, value in return_block.items():
+                if self._record(minion_id):
+                    yield minion_id, value
+            if self.complete:
+                return
+            log.debug(
+                f"Job {self.jid} running. Got {len(self.returned)}/"
+                f"{len(self.targeted)} results. Polling again in {interval:.1f}s..."
+            )
+            await asyncio.sleep(min(interval, max(self._remaining(), 0)))
+            interval = min(interval * 2, self.max_poll_interval)
+
+
+class MinionReturnStream:
+    """
+    Async iterator of `(minion_id, model)` pairs, yielded as each minion of
+    a job returns.
+
+    The job is submitted by awaiting `start` when iteration begins. Unlike
+    `SaltAPIClient.run_command`, a timeout does not raise: iteration simply
+    ends, `timed_out` is set and the minions that never answered are listed
+    in `stragglers`. Returns that do not validate as `model` are skipped and
+    listed in `invalid`.
+    """
+
+    def __init__(
+        self,
+        start: Callable[[], Awaitable[JobReturns]],
+        model: type[BaseModel],
+    ):
+        self.model = model
+        self.invalid: List[str] = []
+        self.__start = start
+        self.__job: Optional[JobReturns] = None
+
+    @property
+    def jid(self) -> Optional[str]:
+        return self.__job.jid if self.__job else None
+
+    @property
+    def timed_out(self) -> bool:
+        return self.__job.timed_out if self.__job else False
+
+    @property
+    def stragglers(self) -> List[str]:
+        return self.__job.stragglers if self.__job else []
+
+    def __aiter__(self) -> AsyncIterator[Tuple[str, Any]]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Tuple[str, Any]]:
+        if self.__job is not None:
+            raise RuntimeError("A MinionReturnStream can only be iterated once")
+        self.__job = job = await self.__start()
+        try:
+            async for minion_id, value in job:
+                try:
+                    validated = self.model.model_validate(value)
+                except ValidationError as e:
+                    log.warning(f"Skipping invalid return from {minion_id}: {e}")
+                    self.invalid.append(minion_id)
+                    continue
+                yield minion_id, validated
+        finally:
+            await job.aclose()
+        if job.timed_out:
+            log.warning(
+                f"Job {job.jid} timed out, {len(job.stragglers)} minions did not "
+                f"return: {', '.join(job.stragglers)}"
+            )
@@ -0,0 +1,70 @@
+import asyncio
+import fnmatch
+import logging
+import re
+import time
+from enum import Enum
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, Field
+
+log = logging.getLogger(__name__)
+
+LOCAL_TARGET_TYPES = {"glob", "list", "pcre"}
+
+
+class KeySource(str, Enum):
+    KEYS = "keys"
+    PRESENT = "present"
+
+
+class KeyCacheConfig(BaseModel):
+    ttl: float = Field(300.0, gt=0, description="Seconds the minion list is reused")
+    source: KeySource = Field(
+        KeySource.KEYS,
+        description="`keys`: accepted keys from /keys, `present`: connected "
+        "minions from the manage.present runner",
+    )
+
+
+class MinionKeyCache:
+    """
+    Minion id list fetched with `fetch` and reused for `ttl` seconds.
+
+    Concurrent `get` calls after expiry share one fetch.
+    """
+
+    def __init__(self, ttl: float, fetch: Callable[[], Awaitable[List[str]]]):
+        self.ttl = ttl
+        self.__fetch = fetch
+        self.__entry: Optional[Tuple[float, List[str]]] = None
+        self.__lock = asyncio.Lock()
+
+    async def get(self, refresh: bool = False) -> List[str]:
+        async with self.__lock:
+            if refresh or self.__entry is None or self.__entry[0] <= time.monotonic():
+                minions = sorted(await self.__fetch())
+                self.__entry = (time.monotonic() + self.ttl, minions)
+                log.debug(f"Cached {len(minions)} minion ids for {self.ttl}s.")
+            return self.__entry[1]
+
+    def invalidate(self):
+        self.__entry = None
+
+
+def expand_target(
+    minions: Iterable[str], target: Union[str, List[str]], target_type: str
+) -> List[str]:
+    """
+    Returns the `minions` matched by a glob, list or pcre target, using the
+    same matching rules as the Salt master.
+    """
+    if target_type == "glob":
+        return [m for m in minions if fnmatch.fnmatchcase(m, str(target))]
+    if target_type == "list":
+        wanted = set(target.split(",") if isinstance(target, str) else target)
+        return [m for m in minions if m in wanted]
+    if target_type == "pcre":
+        pattern = re.compile(str(target))
+        return [m for m in minions if pattern.match(m)]
+    raise ValueError(f"Target type '{target_type}' cannot be expanded locally")
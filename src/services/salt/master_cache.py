@@ -0,0 +1,40 @@
+import logging
+from pathlib import PurePosixPath
+from typing import Any, Dict
+
+from pydantic import BaseModel, Field
+
+log = logging.getLogger(__name__)
+
+MASTER_CACHE_DIR = "/var/cache/salt/master/minions"
+
+
+class MasterCacheConfig(BaseModel):
+    max_age: float = Field(
+        3600.0, gt=0, description="Seconds before cached grains are fetched live"
+    )
+    cache_dir: str = Field(
+        MASTER_CACHE_DIR,
+        description="Minion data directory of the master's localfs cache",
+    )
+    live_fallback: bool = Field(
+        True, description="Fetch stale or missing entries from the minions"
+    )
+
+
+def cache_ages(found: Any, now: float) -> Dict[str, float]:
+    """
+    Maps minion ids to the age, in seconds, of their cache entry, given the
+    output of `file.find <cache_dir> name=data.p print=path,mtime`.
+    """
+    ages: Dict[str, float] = {}
+    if not isinstance(found, list):
+        log.warning(f"Unexpected master cache listing: {str(found)[:200]}")
+        return ages
+    for entry in found:
+        try:
+            path, mtime = entry
+            ages[PurePosixPath(path).parent.name] = max(now - float(mtime), 0.0)
+        except (TypeError, ValueError):
+            log.debug(f"Skipping unexpected master cache entry: {entry}")
+    return ages
@@ -1,6 +1,6 @@
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, RootModel
+from pydantic import BaseModel, ConfigDict, Field, RootModel, model_validator
 
 
 class Grains(BaseModel):
@@ -15,6 +15,40 @@ class Grains(BaseModel):
     fqdn_ip4: List[str] = []
     num_cpus: Optional[int] = None
 
+    @model_validator(mode="before")
+    @classmethod
+    def _drop_missing(cls, data: Any) -> Any:
+        # `grains.item` reports grains a minion does not have as null.
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if value is not None}
+        return data
+
+
+GRAIN_KEYS: List[str] = list(Grains.model_fields)
+
+
+class SaltCall(BaseModel):
+    fun: str
+    args: List[Any] = []
+    kwargs: Dict[str, Any] = {}
+
 
 class MinionGrainsResponse(RootModel[Dict[str, Grains]]):
     pass
+
+
+class CachedGrains(BaseModel):
+    grains: Grains
+    age: Optional[float] = Field(
+        None,
+        description="Seconds since the master cached the grains, 0 if fetched "
+        "live, None if unknown",
+    )
+    live: bool = False
+
+
+class CachedGrainsResponse(RootModel[Dict[str, CachedGrains]]):
+    def to_grains(self) -> MinionGrainsResponse:
+        return MinionGrainsResponse(
+            {key: value.grains for key, value in self.root.items()}
+        )
@@ -1,39 +1,211 @@
 import asyncio
 import logging
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from pydantic import BaseModel
 
 from src.config import Settings
-from src.services.models import ServicesResponses
+from src.etl.incremental import sync_netbox_objects
+from src.services.models import ServicesResponses, SourceResult, SourceStatus
 from src.services.netbox.client import NetBoxAPIClient
+from src.services.netbox.exceptions import NetBoxClientError
+from src.services.netbox.models import Device, IPAddress, VirtualMachine
+from src.services.retry import RetryBudget
 from src.services.salt.client import SaltAPIClient
+from src.services.salt.exceptions import SaltAPIError
 
 log = logging.getLogger(__name__)
 
+Source = Callable[[], Awaitable[Any]]
+
 
 class ServiceGateway:
+    """
+    Entry point to all upstream services.
+
+    Clients are created on first use, so a run that only needs one service
+    never opens connections to (or logs in to) the others. All clients draw
+    on one retry budget per gateway, i.e. per run.
+
+    A failing service does not fail the whole fetch: its data is left out of
+    the response and the error is reported in `ServicesResponses.sources`.
+    Each client has its own circuit breaker, so once a service is known to be
+    down its requests fail immediately instead of waiting for timeouts.
+    """
+
     def __init__(self, settings: Settings):
         self.__settings = settings
-        self.salt_client = SaltAPIClient(
-            api_url=self.__settings.salt.api_url,
-            username=self.__settings.salt.username,
-            password=self.__settings.salt.password,
+        self.retry_budget = RetryBudget(settings.retry_budget)
+        self.__salt_client: Optional[SaltAPIClient] = None
+        self.__salt_lock = asyncio.Lock()
+        self.__netbox_client: Optional[NetBoxAPIClient] = None
+        self.__extra_sources: Dict[str, Source] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def get_salt_client(self) -> SaltAPIClient:
+        async with self.__salt_lock:
+            if self.__salt_client is None:
+                self.__salt_client = await SaltAPIClient.create(
+                    api_url=self.__settings.salt.api_url,
+                    username=self.__settings.salt.username,
+                    password=self.__settings.salt.password,
+                    http=self.__settings.salt.http,
+                    retry_budget=self.retry_budget,
+                    master_cache=self.__settings.salt.master_cache,
+                    key_cache=self.__settings.salt.key_cache,
+                )
+        return self.__salt_client
+
+    @property
+    def netbox_client(self) -> NetBoxAPIClient:
+        if self.__netbox_client is None:
+            self.__netbox_client = NetBoxAPIClient(
+                base_url=str(self.__settings.netbox.base_url),
+                token=self.__settings.netbox.api_token,
+                verify_ssl=self.__settings.netbox.ssl,
+                pagination=self.__settings.netbox.pagination,
+                validation=self.__settings.netbox.validation,
+                bulk=self.__settings.netbox.bulk,
+                batch_gets=self.__settings.netbox.batch_gets,
+                cache=self.__settings.netbox.cache,
+                response_cache_dir=(
+                    self.__settings.paths.data_dir / "http_cache" / "netbox"
+                    if self.__settings.netbox.response_cache
+                    else None
+                ),
+                http=self.__settings.netbox.http,
+                retry_budget=self.retry_budget,
+            )
+        return self.__netbox_client
+
+    async def close(self):
+        if self.__salt_client is not None:
+            await self.__salt_client.close()
+            self.__salt_client = None
+        if self.__netbox_client is not None:
+            await self.__netbox_client.close()
+            self.__netbox_client = None
+
+    def register_source(self, name: str, fetch: Source):
+        """
+        Adds a collector, such as a Xen or AWS inventory, to the sources run
+        by `get_all_service_data`. Its result is returned in
+        `ServicesResponses.extra[name]`.
+        """
+        self.__extra_sources[name] = fetch
+
+    async def _run_source(
+        self, name: str, fetch: Source
+    ) -> Tuple[Optional[Any], SourceResult]:
+        timeout = self.__settings.gateway.timeouts.get(
+            name, self.__settings.gateway.default_timeout
         )
-        self.netbox_client = NetBoxAPIClient(
-            base_url=self.__settings.netbox.base_url.host,  # pyright: ignore
-            token=self.__settings.netbox.api_token,
-            verify_ssl=self.__settings.netbox.ssl,
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                data = await fetch()
+        except TimeoutError:
+            log.error(
+                f"Source {name} timed out after {timeout}s, continuing without it."
+            )
+            return None, SourceResult(
+                status=SourceStatus.TIMEOUT,
+                seconds=time.perf_counter() - started,
+                error=f"Timed out after {timeout}s",
+            )
+        except (SaltAPIError, NetBoxClientError, httpx.RequestError) as e:
+            log.error(f"Source {name} failed, continuing without it: {e}")
+            return None, SourceResult(
+                status=SourceStatus.FAILED,
+                seconds=time.perf_counter() - started,
+                error=str(e) or type(e).__name__,
+            )
+        except Exception as e:
+            # Validation, snapshot I/O or collector bugs must not cost the
+            # other sources their results either.
+            log.exception(f"Source {name} failed unexpectedly, continuing without it")
+            return None, SourceResult(
+                status=SourceStatus.FAILED,
+                seconds=time.perf_counter() - started,
+                error=f"{type(e).__name__}: {e}",
+            )
+        seconds = time.perf_counter() - started
+        log.info(f"Source {name} finished in {seconds:.2f}s.")
+        return data, SourceResult(status=SourceStatus.OK, seconds=seconds)
+
+    async def _salt_grains(self, salt_target: str):
+        salt_client = await self.get_salt_client()
+        return await salt_client.get_minion_grains(
+            target=salt_target,
+            from_cache=self.__settings.salt.master_cache is not None,
+            batch=self.__settings.salt.batch,
         )
 
+    async def _netbox_objects(
+        self, endpoint_name: str, snapshot_name: str, model: type[BaseModel]
+    ) -> List[Any]:
+        endpoint = getattr(self.netbox_client, endpoint_name)
+        if self.__settings.netbox.incremental:
+            return await sync_netbox_objects(
+                endpoint,
+                self.__settings.paths.data_dir / "netbox" / snapshot_name,
+                model,
+                self.__settings.netbox.full_sweep_interval,
+                self.netbox_client.validation,
+            )
+        return [obj async for obj in endpoint.list()]
+
     async def get_all_service_data(self, salt_target: str = "*") -> ServicesResponses:
+        """
+        Fetches every source concurrently, so the whole snapshot takes as
+        long as the slowest source. Sources that fail or exceed their timeout
+        (`gateway.timeouts`) are left empty and reported in `sources`.
+        """
         log.info("Starting data fetch from all services.")
+        sources: Dict[str, Source] = {
+            "salt": partial(self._salt_grains, salt_target),
+            "netbox_devices": partial(
+                self._netbox_objects, "devices", "devices.json", Device
+            ),
+            "netbox_vms": partial(
+                self._netbox_objects, "vms", "virtual_machines.json", VirtualMachine
+            ),
+            "netbox_ips": partial(
+                self._netbox_objects, "ips", "ip_addresses.json", IPAddress
+            ),
+            **self.__extra_sources,
+        }
 
-        async with self.salt_client as active_salt_client:
-            async with asyncio.TaskGroup() as tg:
-                salt_grains_task = tg.create_task(
-                    active_salt_client.get_minion_grains(target=salt_target)
-                )
-        log.info("All service data fetched successfully.")
+        started = time.perf_counter()
+        async with asyncio.TaskGroup() as tg:
+            tasks = {
+                name: tg.create_task(self._run_source(name, fetch))
+                for name, fetch in sources.items()
+            }
+        results = {name: task.result() for name, task in tasks.items()}
 
-        salt_results = salt_grains_task.result()
-        return ServicesResponses(
-            salt=salt_results,
+        response = ServicesResponses(
+            salt=results.pop("salt")[0],
+            netbox_devices=results.pop("netbox_devices")[0],
+            netbox_vms=results.pop("netbox_vms")[0],
+            netbox_ips=results.pop("netbox_ips")[0],
+            extra={name: data for name, (data, _) in results.items()},
+            sources={name: task.result()[1] for name, task in tasks.items()},
         )
+        elapsed = time.perf_counter() - started
+        if response.failed_sources:
+            log.warning(
+                f"Service data fetched in {elapsed:.2f}s, failed sources: "
+                f"{', '.join(response.failed_sources)}"
+            )
+        else:
+            log.info(f"All service data fetched successfully in {elapsed:.2f}s.")
+        return response
@@ -0,0 +1,130 @@
+import importlib.util
+import logging
+from typing import Callable, Dict, Optional
+
+import httpx
+from pydantic import BaseModel, Field
+
+from src.services.circuit import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerTransport,
+)
+from src.services.concurrency import (
+    AdaptiveLimiter,
+    ConcurrencyConfig,
+    LimitedTransport,
+)
+from src.services.retry import (
+    DEFAULT_RETRY_BUDGET,
+    RetryBudget,
+    RetryConfig,
+    RetryTransport,
+)
+
+log = logging.getLogger(__name__)
+
+
+class HTTPConfig(BaseModel):
+    timeout: float = Field(30.0, gt=0, description="Seconds, per read/write")
+    connect_timeout: Optional[float] = Field(
+        None, gt=0, description="Seconds, defaults to `timeout`"
+    )
+    max_connections: int = Field(100, ge=1)
+    max_keepalive_connections: int = Field(20, ge=0)
+    keepalive_expiry: float = Field(30.0, ge=0, description="Seconds")
+    http2: bool = Field(False, description="Requires the `h2` package")
+    compression: bool = Field(
+        True, description="Negotiate gzip, and brotli when it is installed"
+    )
+    concurrency: Optional[ConcurrencyConfig] = Field(
+        None, description="Adaptive in-flight request limit, disabled when unset"
+    )
+    retry: Optional[RetryConfig] = Field(
+        RetryConfig(), description="Retry policy, disabled when null"
+    )
+    circuit_breaker: Optional[CircuitBreakerConfig] = Field(
+        CircuitBreakerConfig(), description="Fail fast while down, disabled when null"
+    )
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def accept_encoding(config: HTTPConfig) -> str:
+    if not config.compression:
+        return "identity"
+    encodings = ["gzip", "deflate"]
+    # httpx can only decode brotli bodies when one of these is installed.
+    if _installed("brotli") or _installed("brotlicffi"):
+        encodings.append("br")
+    return ", ".join(encodings)
+
+
+def create_transport(
+    config: HTTPConfig, verify: bool = True
+) -> httpx.AsyncHTTPTransport:
+    http2 = config.http2
+    if http2 and not _installed("h2"):
+        log.warning("HTTP/2 requested but the 'h2' package is missing, using HTTP/1.1.")
+        http2 = False
+    return httpx.AsyncHTTPTransport(
+        verify=verify,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+    )
+
+
+def create_client(
+    config: HTTPConfig,
+    base_url: str,
+    verify: bool = True,
+    headers: Optional[Dict[str, str]] = None,
+    limiter: Optional[AdaptiveLimiter] = None,
+    retry_budget: Optional[RetryBudget] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    probe_path: Optional[str] = None,
+    name: str = "",
+    wrap_transport: Optional[
+        Callable[[httpx.AsyncBaseTransport], httpx.AsyncBaseTransport]
+    ] = None,
+) -> httpx.AsyncClient:
+    """
+    Builds an `httpx.AsyncClient` with the pool, timeout and protocol settings
+    of `config`.
+
+    Requests pass through `limiter` and `breaker` when given, and failed
+    requests are retried according to `config.retry`, drawing on
+    `retry_budget` (a fresh budget per client when omitted). Every attempt
+    goes through the limiter and breaker separately, so retries stop as soon
+    as the circuit opens. The breaker probes `probe_path` for recovery.
+    `wrap_transport` receives the resulting transport and may return a
+    transport that wraps it, e.g. to add caching.
+    """
+    transport: httpx.AsyncBaseTransport = create_transport(config, verify)
+    if limiter:
+        transport = LimitedTransport(transport, limiter)
+    if breaker:
+        transport = CircuitBreakerTransport(transport, breaker, probe_path)
+    if config.retry:
+        transport = RetryTransport(
+            transport,
+            config.retry,
+            retry_budget or RetryBudget(DEFAULT_RETRY_BUDGET),
+            name,
+        )
+    if wrap_transport:
+        transport = wrap_transport(transport)
+    return httpx.AsyncClient(
+        base_url=base_url,
+        headers={"Accept-Encoding": accept_encoding(config), **(headers or {})},
+        timeout=httpx.Timeout(
+            config.timeout, connect=config.connect_timeout or config.timeout
+        ),
+        transport=transport,
+    )
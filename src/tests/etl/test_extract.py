@@ -0,0 +1,102 @@
+import csv
+
+import pytest
+import respx
+from httpx import Response
+
+from src.etl.extract import list_netbox_ips, stream_netbox_ips
+from src.etl.load import export_objects_to_csv
+from src.services.netbox.client import NetBoxAPIClient
+from src.services.netbox.exceptions import NetBoxAPIError
+from src.services.netbox.models import IPAddress
+from src.services.netbox.pagination import PaginationConfig
+from src.services.netbox.validation import ValidationMode, trusted_model
+from src.tests.helpers.netbox import IP_LIST_URL, MOCK_API_URL, make_ip
+
+pytestmark = pytest.mark.asyncio
+
+
+def page(ids, next_url=None, last_updated="2025-01-01T00:00:00Z") -> Response:
+    return Response(
+        200,
+        json={
+            "count": 5,
+            "next": next_url,
+            "previous": None,
+            "results": [make_ip(ip_id, last_updated) for ip_id in ids],
+        },
+    )
+
+
+@respx.mock
+async def test_streamed_chunks_are_written_to_csv(tmp_path):
+    respx.get(IP_LIST_URL).mock(
+        side_effect=[page([1, 2, 3], f"{IP_LIST_URL}?offset=3"), page([4, 5])]
+    )
+    client = NetBoxAPIClient(
+        base_url=MOCK_API_URL,
+        token="fake-token",
+        pagination=PaginationConfig(page_size=3),
+    )
+    path = tmp_path / "ips.csv"
+
+    chunk_sizes = []
+
+    async def chunks():
+        async for chunk in stream_netbox_ips(client, chunk_size=2):
+            chunk_sizes.append(len(chunk))
+            yield chunk
+
+    count = await export_objects_to_csv(
+        path, {"ID": ("id", None), "Address": ("address", str)}, chunks()
+    )
+    await client.close()
+
+    with open(path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert count == 5
+    assert chunk_sizes == [2, 2, 1]
+    assert [row["ID"] for row in rows] == ["1", "2", "3", "4", "5"]
+    assert rows[0]["Address"] == "10.0.0.1/32"
+
+
+@respx.mock
+async def test_stream_errors_propagate():
+    respx.get(IP_LIST_URL).mock(
+        side_effect=[page([1, 2, 3], f"{IP_LIST_URL}?offset=3"), Response(500)]
+    )
+    client = NetBoxAPIClient(base_url=MOCK_API_URL, token="fake-token")
+
+    seen = []
+    with pytest.raises(NetBoxAPIError):
+        async for ip in stream_netbox_ips(client):
+            seen.append(ip.id)
+    await client.close()
+
+    assert seen == [1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    "validation, expected_type",
+    [
+        (ValidationMode.RAW, dict),
+        (ValidationMode.TRUSTED, trusted_model(IPAddress)),
+    ],
+)
+@respx.mock
+async def test_incremental_list_keeps_the_client_validation_mode(
+    tmp_path, validation, expected_type
+):
+    route = respx.get(IP_LIST_URL).mock(
+        side_effect=[page([1]), page([2], last_updated="2025-01-02T00:00:00Z")]
+    )
+    client = NetBoxAPIClient(
+        base_url=MOCK_API_URL, token="fake-token", validation=validation
+    )
+
+    await list_netbox_ips(client, snapshot_dir=tmp_path)
+    ips = await list_netbox_ips(client, snapshot_dir=tmp_path)
+    await client.close()
+
+    assert "last_updated__gte" in route.calls[1].request.url.params
+    assert [type(ip) for ip in ips] == [expected_type, expected_type]
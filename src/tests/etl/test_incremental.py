@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.etl.incremental import load_snapshot, sync_netbox_objects
+from src.services.netbox.models import IP_ADDRESS_ADAPTER, IPAddress
+from src.services.netbox.validation import ValidationMode
+from src.tests.helpers.netbox import make_ip as ip_payload
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_ip(ip_id: int, last_updated: str) -> IPAddress:
+    return IP_ADDRESS_ADAPTER.validate_python(ip_payload(ip_id, last_updated))
+
+
+class FakeEndpoint:
+    def __init__(self, objects):
+        self.objects = objects
+        self.calls = []
+
+    async def list(self, filters=None):
+        self.calls.append(filters)
+        for obj in self.objects:
+            last_updated = (
+                datetime.fromisoformat(obj["last_updated"])
+                if isinstance(obj, dict)
+                else obj.last_updated
+            )
+            if filters and last_updated < filters.last_updated__gte:
+                continue
+            yield obj
+
+
+async def test_incremental_sync_merges_changes_and_sweeps_deletions(tmp_path):
+    path = tmp_path / "ip_addresses.json"
+    endpoint = FakeEndpoint(
+        [make_ip(1, "2025-01-01T00:00:00Z"), make_ip(2, "2025-01-02T00:00:00Z")]
+    )
+
+    objects = await sync_netbox_objects(endpoint, path, IPAddress)
+    assert [ip.id for ip in objects] == [1, 2]
+    assert endpoint.calls == [None]
+
+    endpoint.objects = [
+        make_ip(2, "2025-01-03T00:00:00Z"),
+        make_ip(3, "2025-01-04T00:00:00Z"),
+    ]
+    objects = await sync_netbox_objects(endpoint, path, IPAddress)
+    assert endpoint.calls[-1].last_updated__gte == datetime(
+        2025, 1, 2, tzinfo=timezone.utc
+    )
+    assert sorted(ip.id for ip in objects) == [1, 2, 3]
+    assert load_snapshot(path).watermark == datetime(2025, 1, 4, tzinfo=timezone.utc)
+
+    objects = await sync_netbox_objects(
+        endpoint, path, IPAddress, full_sweep_interval=timedelta(0)
+    )
+    assert endpoint.calls[-1] is None
+    assert sorted(ip.id for ip in objects) == [2, 3]
+
+
+async def test_incremental_sync_keeps_raw_objects_as_dicts(tmp_path):
+    path = tmp_path / "ip_addresses.json"
+    first, second = (
+        make_ip(1, "2025-01-01T00:00:00Z").model_dump(mode="json"),
+        make_ip(2, "2025-01-02T00:00:00Z").model_dump(mode="json"),
+    )
+    endpoint = FakeEndpoint([first])
+    await sync_netbox_objects(endpoint, path, IPAddress, validation=ValidationMode.RAW)
+
+    endpoint.objects = [second]
+    objects = await sync_netbox_objects(
+        endpoint, path, IPAddress, validation=ValidationMode.RAW
+    )
+
+    assert endpoint.calls[-1] is not None
+    assert objects == [first, second]
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.etl.pipeline import Offload, Pipeline, Stage
+
+pytestmark = pytest.mark.asyncio
+
+
+async def numbers(count):
+    for number in range(count):
+        yield number
+
+
+async def test_items_flow_through_all_stages_with_backpressure():
+    loaded = []
+    threads = set()
+    max_in_flight = 0
+
+    def parse(chunk):
+        threads.add(threading.current_thread().name)
+        return [value * 2 for value in chunk]
+
+    async def load(value):
+        nonlocal max_in_flight
+        await asyncio.sleep(0.001)
+        loaded.append(value)
+
+    async def chunks():
+        nonlocal max_in_flight
+        async for number in numbers(20):
+            # Source items that were produced but not yet loaded.
+            max_in_flight = max(max_in_flight, number - len(loaded))
+            yield [number]
+
+    pipeline = Pipeline(
+        chunks(),
+        [
+            Stage("parse", parse, workers=2, queue_size=2, offload=Offload.THREAD),
+            Stage("flatten", lambda chunk: chunk, flatten=True, queue_size=2),
+            Stage("load", load, workers=2, queue_size=2),
+        ],
+    )
+    stats = await pipeline.run()
+
+    assert sorted(loaded) == [number * 2 for number in range(20)]
+    assert all(name.startswith("pipeline") for name in threads)
+    assert stats["parse"].items_in == 20
+    assert stats["load"].items_out == 0
+    assert stats["load"].max_queue_depth <= 2
+    # Queues of 2 and a few workers bound what the source can run ahead.
+    assert max_in_flight <= 12
+
+
+async def test_stage_errors_cancel_the_pipeline():
+    def fail(value):
+        if value == 3:
+            raise ValueError("bad item")
+        return value
+
+    loaded = []
+    pipeline = Pipeline(
+        numbers(100), [Stage("check", fail), Stage("load", loaded.append)]
+    )
+
+    with pytest.raises(ValueError, match="bad item"):
+        await pipeline.run()
+    assert len(loaded) < 100
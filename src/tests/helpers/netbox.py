@@ -0,0 +1,22 @@
+from typing import Optional
+
+MOCK_API_URL = "https://mock.api"
+IP_LIST_URL = f"{MOCK_API_URL}/api/ipam/ip-addresses/"
+
+
+def make_ip(
+    ip_id: int,
+    last_updated: str = "2025-01-01T00:00:00Z",
+    address: Optional[str] = None,
+) -> dict:
+    """NetBox IP address payload, as returned by the ip-addresses endpoints."""
+    address = address or f"10.0.0.{ip_id}/32"
+    return {
+        "id": ip_id,
+        "url": f"{IP_LIST_URL}{ip_id}/",
+        "display": address,
+        "family": {"value": 4, "label": "IPv4"},
+        "address": address,
+        "created": "2025-01-01T00:00:00Z",
+        "last_updated": last_updated,
+    }
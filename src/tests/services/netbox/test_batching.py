@@ -0,0 +1,45 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from src.services.netbox.client import NetBoxAPIClient
+from src.services.netbox.exceptions import NetBoxAPIError
+from src.tests.helpers.netbox import IP_LIST_URL, MOCK_API_URL, make_ip
+
+pytestmark = pytest.mark.asyncio
+
+
+def ips_by_id(request: httpx.Request) -> Response:
+    ids = [int(ip_id) for ip_id in request.url.params.get_list("id") if ip_id != "404"]
+    results = [make_ip(ip_id) for ip_id in ids]
+    return Response(
+        200,
+        json={
+            "count": len(results),
+            "next": None,
+            "previous": None,
+            "results": results,
+        },
+    )
+
+
+@respx.mock
+async def test_concurrent_gets_are_coalesced_into_one_request():
+    route = respx.get(IP_LIST_URL).mock(side_effect=ips_by_id)
+    client = NetBoxAPIClient(base_url=MOCK_API_URL, token="fake-token", batch_gets=True)
+
+    ips = await asyncio.gather(
+        client.ips.get(3), client.ips.get(1), client.ips.get(3), client.ips.get("2")
+    )
+    with pytest.raises(NetBoxAPIError) as excinfo:
+        await client.ips.get(404)
+    await client.close()
+
+    assert [ip.id for ip in ips] == [3, 1, 3, 2]
+    assert route.calls[0].request.url.params.get_list("id") == ["3", "1", "2"]
+    assert route.call_count == 2
+    assert excinfo.value.status_code == 404
+    assert client.ips.pagination_stats.pages == 0
@@ -0,0 +1,71 @@
+import json
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from src.services.netbox.bulk import BulkConfig
+from src.services.netbox.client import NetBoxAPIClient
+from src.services.netbox.models import IPAddress, PatchedIPAddress, WritableIPAddress
+from src.tests.helpers.netbox import IP_LIST_URL, MOCK_API_URL, make_ip
+
+pytestmark = pytest.mark.asyncio
+
+
+def bulk_create(request: httpx.Request) -> Response:
+    payloads = json.loads(request.content)
+    if any(payload["address"] == "bad" for payload in payloads):
+        return Response(400, json=[{"address": ["Enter a valid IPv4 address."]}])
+    created = [
+        make_ip(index + 1, address=payload["address"])
+        for index, payload in enumerate(payloads)
+    ]
+    return Response(201, json=created)
+
+
+@respx.mock
+async def test_bulk_create_reports_failed_chunks_per_object():
+    route = respx.post(IP_LIST_URL).mock(side_effect=bulk_create)
+    client = NetBoxAPIClient(
+        base_url=MOCK_API_URL, token="fake-token", bulk=BulkConfig(batch_size=2)
+    )
+
+    addresses = ["10.0.0.1/32", "10.0.0.2/32", "bad", "10.0.0.4/32", "10.0.0.5/32"]
+    result = await client.ips.bulk_create_ip_addresses(
+        [WritableIPAddress(address=address) for address in addresses]
+    )
+    await client.close()
+
+    assert route.call_count == 3
+    assert [ip.address for ip in result.succeeded] == [
+        "10.0.0.1/32",
+        "10.0.0.2/32",
+        "10.0.0.5/32",
+    ]
+    assert all(isinstance(ip, IPAddress) for ip in result.succeeded)
+    assert [failure.index for failure in result.failed] == [2, 3]
+    assert {failure.status_code for failure in result.failed} == {400}
+    assert not result.ok
+
+
+@respx.mock
+async def test_bulk_update_and_delete_send_ids():
+    patch_route = respx.patch(IP_LIST_URL).mock(
+        return_value=Response(200, json=[make_ip(7)])
+    )
+    delete_route = respx.delete(IP_LIST_URL).mock(return_value=Response(204))
+    client = NetBoxAPIClient(base_url=MOCK_API_URL, token="fake-token")
+
+    updated = await client.ips.bulk_update_ip_addresses(
+        {7: PatchedIPAddress(description="uplink")}
+    )
+    deleted = await client.ips.bulk_delete_ip_addresses([7, 8])
+    await client.close()
+
+    assert json.loads(patch_route.calls[0].request.content) == [
+        {"description": "uplink", "id": 7}
+    ]
+    assert updated.ok and updated.succeeded[0].id == 7
+    assert json.loads(delete_route.calls[0].request.content) == [{"id": 7}, {"id": 8}]
+    assert deleted.succeeded == [7, 8]
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+import respx
+from httpx import Response
+
+from src.services.netbox.cache import CacheConfig, TTLCache
+from src.services.netbox.client import NetBoxAPIClient
+from src.services.netbox.models import PatchedIPAddress
+from src.tests.helpers.netbox import MOCK_API_URL, make_ip
+
+pytestmark = pytest.mark.asyncio
+
+IP = make_ip(1)
+IP_URL = IP["url"]
+
+
+@respx.mock
+async def test_get_is_cached_single_flight_and_invalidated_on_update():
+    get_route = respx.get(IP_URL).mock(return_value=Response(200, json=IP))
+    respx.patch(IP_URL).mock(return_value=Response(200, json=IP))
+    client = NetBoxAPIClient(
+        base_url=MOCK_API_URL, token="fake-token", cache=CacheConfig()
+    )
+
+    await asyncio.gather(client.ips.get(1), client.ips.get(1), client.ips.get("1"))
+    await client.ips.get(1)
+    assert get_route.call_count == 1
+
+    await client.ips.update_ip_address(PatchedIPAddress(description="x"), 1)
+    await client.ips.get(1)
+    await client.close()
+
+    assert get_route.call_count == 2
+    stats = client.cache_stats["ips"]
+    assert (stats.hits, stats.misses, stats.coalesced, stats.invalidations) == (
+        1,
+        2,
+        2,
+        1,
+    )
+    assert client.devices.cache_stats.misses == 0
+
+
+async def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats.evictions == 1
+
+
+async def test_ttl_cache_drops_generations_once_fetches_finish():
+    cache = TTLCache(max_size=2, ttl=60)
+    release = asyncio.Event()
+
+    async def stale_fetch():
+        await release.wait()
+        return "stale"
+
+    async def fresh_fetch():
+        return "fresh"
+
+    cache.invalidate("a")
+    orphaned = asyncio.create_task(cache.get_or_fetch("a", stale_fetch))
+    await asyncio.sleep(0)
+    cache.invalidate("a")
+    assert await cache.get_or_fetch("a", fresh_fetch) == "fresh"
+    release.set()
+    assert await orphaned == "stale"
+
+    assert cache.get("a") == "fresh"
+    assert cache._TTLCache__generations == {}
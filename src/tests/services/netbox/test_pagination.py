@@ -0,0 +1,201 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from src.services.netbox.client import NetBoxAPIClient
+from src.services.netbox.exceptions import NetBoxAPIError
+from src.services.netbox.models import BriefIPAddress, IPAddress, ListFilter
+from src.services.netbox.pagination import PaginationConfig, PaginationMode
+from src.services.netbox.validation import ValidationMode
+from src.tests.helpers.netbox import IP_LIST_URL, MOCK_API_URL, make_ip
+from src.utils.parse import create_parser
+
+pytestmark = pytest.mark.asyncio
+
+TOTAL_IPS = 7
+
+
+def ip_page(request: httpx.Request) -> Response:
+    limit = int(request.url.params.get("limit", 2))
+    offset = int(request.url.params.get("offset", 0))
+    if "id__gt" in request.url.params:
+        offset = int(request.url.params["id__gt"])
+    ids = range(offset + 1, min(offset + limit, TOTAL_IPS) + 1)
+    next_url = None
+    if offset + limit < TOTAL_IPS:
+        next_url = f"{IP_LIST_URL}?limit={limit}&offset={offset + limit}"
+    return Response(
+        200,
+        json={
+            "count": TOTAL_IPS,
+            "next": next_url,
+            "previous": None,
+            "results": [make_ip(ip_id) for ip_id in ids],
+        },
+    )
+
+
+@respx.mock
+@pytest.mark.parametrize("mode", [PaginationMode.SERIAL, PaginationMode.PARALLEL])
+async def test_list_yields_every_object_in_order(mode):
+    route = respx.get(IP_LIST_URL).mock(side_effect=ip_page)
+    client = NetBoxAPIClient(
+        base_url=MOCK_API_URL,
+        token="fake-token",
+        pagination=PaginationConfig(page_size=2, max_concurrency=3),
+    )
+
+    ips = [ip async for ip in client.ips.list(mode=mode)]
+    await client.close()
+
+    assert all(isinstance(ip, IPAddress) for ip in ips)
+    assert [ip.id for ip in ips] == list(range(1, TOTAL_IPS + 1))
+    assert route.call_count == 4
+
+
+@respx.mock
+async def test_parallel_list_uses_offset_windows():
+    route = respx.get(IP_LIST_URL).mock(side_effect=ip_page)
+    client = NetBoxAPIClient(base_url=MOCK_API_URL, token="fake-token")
+    client.ips.pagination.page_size = 3
+    client.ips.pagination.mode = PaginationMode.PARALLEL
+
+    ips = [ip async for ip in client.ips.list()]
+    await client.close()
+
+    offsets = sorted(int(call.request.url.params["offset"]) for call in route.calls)
+    assert offsets == [0, 3, 6]
+    assert len(ips) == TOTAL_IPS
+    assert client.devices.pagination.mode == PaginationMode.SERIAL
+
+
+@respx.mock
+async def test_prefetch_downloads_ahead_and_counts_wait_time():
+    route = respx.get(IP_LIST_URL).mock(side_effect=ip_page)
+    client = NetBoxAPIClient(
+        base_url=MOCK_API_URL,
+        token="fake-token",
+        pagination=PaginationConfig(page_size=2, prefetch=2),
+    )
+
+    ips = client.ips.list()
+    first_ip = await anext(ips)
+    # Let the prefetch task run while the consumer is still on the first page.
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert route.call_count == 4
+
+    remaining = [ip async for ip in ips]
+    await client.close()
+
+    assert [first_ip.id] + [ip.id for ip in remaining] == list(range(1, TOTAL_IPS + 1))
+    assert client.ips.pagination_stats.pages == 4
+    assert client.ips.pagination_stats.page_wait_seconds > 0
+
+
+@respx.mock
+async def test_keyset_list_can_resume_from_cursor():
+    failing_page = Response(500, text="Internal Server Error")
+    route = respx.get(IP_LIST_URL).mock(
+        side_effect=[ip_page, ip_page, failing_page, ip_page, ip_page]
+    )
+    client = NetBoxAPIClient(
+        base_url=MOCK_API_URL,
+        token="fake-token",
+        pagination=PaginationConfig(page_size=2, mode=PaginationMode.KEYSET),
+    )
+
+    seen = []
+    with pytest.raises(NetBoxAPIError):
+        async for ip in client.ips.list():
+            seen.append(ip.id)
+    assert client.ips.cursor == 4
+
+    async for ip in client.ips.list(cursor=client.ips.cursor):
+        seen.append(ip.id)
+    await client.close()
+
+    assert seen == list(range(1, TOTAL_IPS + 1))
+    assert route.calls[0].request.url.params["ordering"] == "id"
+    assert route.calls[3].request.url.params["id__gt"] == "4"
+
+
+@respx.mock
+@pytest.mark.parametrize("validation", list(ValidationMode))
+async def test_validation_modes_feed_the_csv_parser(validation):
+    respx.get(IP_LIST_URL).mock(side_effect=ip_page)
+    client = NetBoxAPIClient(
+        base_url=MOCK_API_URL, token="fake-token", validation=validation
+    )
+
+    ips = [ip async for ip in client.ips.list()]
+    await client.close()
+
+    if validation == ValidationMode.RAW:
+        assert all(isinstance(ip, dict) for ip in ips)
+    else:
+        assert all(isinstance(ip, IPAddress) for ip in ips)
+    parser = create_parser(
+        {"Address": ("address", None), "Family": ("family.label", None)}
+    )
+    headers, rows = parser(ips)
+    assert headers == ["Address", "Family"]
+    assert rows[0] == {"Address": "10.0.0.1/32", "Family": "IPv4"}
+
+
+@respx.mock
+async def test_list_sends_filters_and_projection():
+    def projected_page(request: httpx.Request) -> Response:
+        fields = request.url.params["fields"].split(",")
+        results = [
+            {key: value for key, value in make_ip(ip_id).items() if key in fields}
+            for ip_id in (1, 2)
+        ]
+        return Response(
+            200, json={"count": 2, "next": None, "previous": None, "results": results}
+        )
+
+    route = respx.get(IP_LIST_URL).mock(side_effect=projected_page)
+    client = NetBoxAPIClient(base_url=MOCK_API_URL, token="fake-token")
+
+    filters = ListFilter(tenant=["ops", "infra"], status="active", q="10.0")
+    ips = [ip async for ip in client.ips.list(filters=filters, fields=["address"])]
+    await client.close()
+
+    params = route.calls[0].request.url.params
+    assert params.get_list("tenant") == ["ops", "infra"]
+    assert params["status"] == "active"
+    assert params["q"] == "10.0"
+    assert params["fields"] == "id,address"
+    assert all(isinstance(ip, IPAddress) for ip in ips)
+    assert [(ip.id, ip.address, ip.display) for ip in ips] == [
+        (1, "10.0.0.1/32", None),
+        (2, "10.0.0.2/32", None),
+    ]
+
+
+@respx.mock
+async def test_brief_list_yields_brief_models():
+    def brief_page(request: httpx.Request) -> Response:
+        results = [
+            {
+                key: make_ip(1)[key]
+                for key in ("id", "url", "display", "family", "address")
+            }
+        ]
+        return Response(
+            200, json={"count": 1, "next": None, "previous": None, "results": results}
+        )
+
+    route = respx.get(IP_LIST_URL).mock(side_effect=brief_page)
+    client = NetBoxAPIClient(base_url=MOCK_API_URL, token="fake-token")
+
+    ips = [ip async for ip in client.ips.list(brief=True)]
+    await client.close()
+
+    assert route.calls[0].request.url.params["brief"] == "1"
+    assert isinstance(ips[0], BriefIPAddress)
+    assert ips[0].address == "10.0.0.1/32"
@@ -0,0 +1,41 @@
+import pytest
+import respx
+from httpx import Response
+
+from src.services.netbox.client import NetBoxAPIClient
+from src.tests.helpers.netbox import MOCK_API_URL, make_ip
+
+pytestmark = pytest.mark.asyncio
+
+IP = make_ip(1)
+IP_URL = IP["url"]
+
+
+def etag_responder(request):
+    if request.headers.get("If-None-Match") == '"v1"':
+        return Response(304, headers={"ETag": '"v1"'})
+    return Response(200, json=IP, headers={"ETag": '"v1"'})
+
+
+@respx.mock
+async def test_unchanged_responses_are_served_from_disk(tmp_path):
+    route = respx.get(IP_URL).mock(side_effect=etag_responder)
+
+    async with NetBoxAPIClient(
+        base_url=MOCK_API_URL, token="fake-token", response_cache_dir=tmp_path
+    ) as client:
+        first = await client.ips.get(1)
+
+    # A new client, as on the next run, only revalidates.
+    async with NetBoxAPIClient(
+        base_url=MOCK_API_URL, token="fake-token", response_cache_dir=tmp_path
+    ) as client:
+        second = await client.ips.get(1)
+        third = await client.ips.get(1)
+
+    assert route.call_count == 3
+    assert "If-None-Match" not in route.calls[0].request.headers
+    assert route.calls[1].request.headers["If-None-Match"] == '"v1"'
+    assert route.calls[2].response.status_code == 304
+    assert first == second
+    assert third == second
@@ -0,0 +1,186 @@
+import json
+
+import pytest
+import respx
+from httpx import Response
+
+from src.services.salt.client import SaltAPIClient
+from src.services.salt.models import Grains, SaltCall
+
+pytestmark = pytest.mark.asyncio
+
+MOCK_API_URL = "https://salt.api"
+JID = "20250101000000000001"
+
+
+def sse(tag: str, data: dict) -> str:
+    return f"tag: {tag}\ndata: {json.dumps({'tag': tag, 'data': data})}\n\n"
+
+
+def ret_event(minion_id: str) -> str:
+    return sse(
+        f"salt/job/{JID}/ret/{minion_id}",
+        {"id": minion_id, "jid": JID, "return": {"host": minion_id}},
+    )
+
+
+async def logged_in_client() -> SaltAPIClient:
+    respx.post(f"{MOCK_API_URL}/login").mock(
+        return_value=Response(200, json={"return": [{"token": "abc"}]})
+    )
+    respx.post(f"{MOCK_API_URL}/minions").mock(
+        return_value=Response(
+            200, json={"return": [{"jid": JID, "minions": ["web1", "web2"]}]}
+        )
+    )
+    return await SaltAPIClient.create(MOCK_API_URL, "user", "pass")
+
+
+@respx.mock
+async def test_run_command_completes_from_event_stream():
+    stream = (
+        "retry: 400\n\n"
+        + sse("salt/auth", {"id": "other"})
+        + ret_event("web1")
+        + sse("salt/job/999/ret/web2", {"id": "web2", "return": {}})
+        + ret_event("web2")
+    )
+    events = respx.get(f"{MOCK_API_URL}/events").mock(
+        return_value=Response(
+            200, headers={"Content-Type": "text/event-stream"}, text=stream
+        )
+    )
+    jobs = respx.get(f"{MOCK_API_URL}/jobs/{JID}")
+    client = await logged_in_client()
+
+    result = await client.run_command("grains.items", "web*")
+    await client.close()
+
+    assert result == {"web1": {"host": "web1"}, "web2": {"host": "web2"}}
+    paths = [call.request.url.path for call in respx.calls]
+    assert paths == ["/login", "/events", "/minions"]
+    assert events.calls[0].request.headers["X-Auth-Token"] == "abc"
+    assert not jobs.called
+
+
+@respx.mock
+async def test_run_command_falls_back_to_polling():
+    respx.get(f"{MOCK_API_URL}/events").mock(return_value=Response(404))
+    jobs = respx.get(f"{MOCK_API_URL}/jobs/{JID}").mock(
+        side_effect=[
+            Response(200, json={"info": [{}], "return": [{"web1": {"host": "web1"}}]}),
+            Response(
+                200,
+                json={
+                    "info": [{}],
+                    "return": [{"web1": {"host": "web1"}, "web2": {"host": "web2"}}],
+                },
+            ),
+        ]
+    )
+    client = await logged_in_client()
+
+    result = await client.run_command("grains.items", "web*", poll_interval=0.001)
+    await client.close()
+
+    assert set(result) == {"web1", "web2"}
+    assert jobs.call_count == 2
+
+
+@respx.mock
+async def test_stream_yields_grains_and_reports_stragglers_on_timeout():
+    respx.get(f"{MOCK_API_URL}/events").mock(return_value=Response(404))
+    respx.get(f"{MOCK_API_URL}/jobs/{JID}").mock(
+        return_value=Response(
+            200,
+            json={"info": [{}], "return": [{"web1": {"host": "web1", "num_cpus": 4}}]},
+        )
+    )
+    client = await logged_in_client()
+
+    stream = client.stream_minion_grains("web*", timeout=0.05)
+    received = [(minion_id, grains.num_cpus) async for minion_id, grains in stream]
+    await client.close()
+
+    assert received == [("web1", 4)]
+    assert stream.timed_out
+    assert stream.stragglers == ["web2"]
+
+
+@respx.mock
+async def test_get_minion_grains_requests_only_model_fields():
+    respx.get(f"{MOCK_API_URL}/events").mock(return_value=Response(404))
+    respx.get(f"{MOCK_API_URL}/jobs/{JID}").mock(
+        return_value=Response(
+            200,
+            json={
+                "info": [{}],
+                "return": [
+                    {
+                        "web1": {"host": "web1", "fqdn_ip4": None},
+                        "web2": {"host": "web2", "mem_total": 2048},
+                    }
+                ],
+            },
+        )
+    )
+    client = await logged_in_client()
+
+    grains = await client.get_minion_grains("web*", use_events=False)
+    await client.close()
+
+    lowstate = json.loads(respx.calls[1].request.content)[0]
+    assert lowstate["fun"] == "grains.item"
+    assert lowstate["arg"] == list(Grains.model_fields)
+    assert lowstate["kwarg"] == {"default": None}
+    assert grains.root["web1"].fqdn_ip4 == []
+    assert grains.root["web2"].mem_total == 2048
+
+
+@respx.mock
+async def test_run_many_submits_one_request_and_shares_event_stream():
+    ping_jid, version_jid = "20250101000000000002", "20250101000000000003"
+    stream = "".join(
+        sse(f"salt/job/{jid}/ret/{minion_id}", {"id": minion_id, "return": value})
+        for jid, minion_id, value in [
+            (version_jid, "web1", "3007.1"),
+            (ping_jid, "web1", True),
+            (ping_jid, "web2", True),
+            (version_jid, "web2", "3006.9"),
+        ]
+    )
+    respx.post(f"{MOCK_API_URL}/login").mock(
+        return_value=Response(200, json={"return": [{"token": "abc"}]})
+    )
+    minions = respx.post(f"{MOCK_API_URL}/minions").mock(
+        return_value=Response(
+            200,
+            json={
+                "return": [
+                    {"jid": ping_jid, "minions": ["web1", "web2"]},
+                    {"jid": version_jid, "minions": ["web1", "web2"]},
+                ]
+            },
+        )
+    )
+    events = respx.get(f"{MOCK_API_URL}/events").mock(
+        return_value=Response(
+            200, headers={"Content-Type": "text/event-stream"}, text=stream
+        )
+    )
+    client = await SaltAPIClient.create(MOCK_API_URL, "user", "pass")
+
+    results = await client.run_many(
+        [SaltCall(fun="test.ping"), SaltCall(fun="pkg.version", args=["salt-minion"])],
+        "web*",
+    )
+    await client.close()
+
+    assert results == {
+        "test.ping": {"web1": True, "web2": True},
+        "pkg.version": {"web1": "3007.1", "web2": "3006.9"},
+    }
+    lowstate = json.loads(minions.calls[0].request.content)
+    assert [chunk["fun"] for chunk in lowstate] == ["test.ping", "pkg.version"]
+    assert minions.call_count == 1
+    assert events.call_count == 1
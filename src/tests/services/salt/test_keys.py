@@ -0,0 +1,55 @@
+import pytest
+import respx
+from httpx import Response
+
+from src.services.salt.client import SaltAPIClient
+from src.services.salt.keys import KeyCacheConfig, expand_target
+
+MOCK_API_URL = "https://salt.api"
+MINIONS = ["cy11-db1", "cy11-web1", "cy12-web1"]
+
+
+@pytest.mark.parametrize(
+    "target, target_type, expected",
+    [
+        ("cy11*", "glob", ["cy11-db1", "cy11-web1"]),
+        ("*-web[0-9]", "glob", ["cy11-web1", "cy12-web1"]),
+        ("cy12-web1,unknown", "list", ["cy12-web1"]),
+        (["cy11-db1"], "list", ["cy11-db1"]),
+        (r"cy1\d-web", "pcre", ["cy11-web1", "cy12-web1"]),
+    ],
+)
+def test_expand_target(target, target_type, expected):
+    assert expand_target(MINIONS, target, target_type) == expected
+
+
+def test_expand_target_rejects_master_only_types():
+    with pytest.raises(ValueError):
+        expand_target(MINIONS, "os:Debian", "grain")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_resolve_target_uses_cached_key_list():
+    respx.post(f"{MOCK_API_URL}/login").mock(
+        return_value=Response(200, json={"return": [{"token": "abc"}]})
+    )
+    keys = respx.get(f"{MOCK_API_URL}/keys").mock(
+        return_value=Response(
+            200,
+            json={"return": {"minions": list(reversed(MINIONS)), "minions_pre": []}},
+        )
+    )
+    minions = respx.post(f"{MOCK_API_URL}/minions")
+    client = await SaltAPIClient.create(
+        MOCK_API_URL, "user", "pass", key_cache=KeyCacheConfig(ttl=60)
+    )
+
+    assert await client.resolve_target("cy11*") == ["cy11-db1", "cy11-web1"]
+    assert await client.resolve_target("cy12-web1", "list") == ["cy12-web1"]
+    assert await client.get_minion_ids() == MINIONS
+    await client.get_minion_ids(refresh=True)
+    await client.close()
+
+    assert keys.call_count == 2
+    assert not minions.called
@@ -0,0 +1,161 @@
+import json
+import time
+
+import pytest
+import respx
+from httpx import Request, Response
+
+from src.services.salt.batching import BatchConfig
+from src.services.salt.client import SaltAPIClient
+from src.services.salt.master_cache import (
+    MASTER_CACHE_DIR,
+    MasterCacheConfig,
+    cache_ages,
+)
+
+MOCK_API_URL = "https://salt.api"
+JID = "20250101000000000001"
+
+
+def test_cache_ages_reads_minion_id_from_path():
+    found = [
+        [f"{MASTER_CACHE_DIR}/web1/data.p", 900],
+        [f"{MASTER_CACHE_DIR}/web2/data.p", 1100],
+        "garbage",
+    ]
+    assert cache_ages(found, now=1000) == {"web1": 100.0, "web2": 0.0}
+    assert cache_ages("'salt.cmd' is not available.", now=1000) == {}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_cached_grains_refresh_only_stale_entries():
+    now = time.time()
+
+    def runner(request: Request) -> Response:
+        lowstate = json.loads(request.content)[0]
+        if lowstate["fun"] == "cache.grains":
+            result = {
+                "fresh": {"host": "fresh", "num_cpus": 2},
+                "stale": {"host": "stale", "num_cpus": 2},
+            }
+        else:
+            result = [
+                [f"{MASTER_CACHE_DIR}/fresh/data.p", now - 60],
+                [f"{MASTER_CACHE_DIR}/stale/data.p", now - 7200],
+            ]
+        return Response(200, json={"return": [result]})
+
+    respx.post(f"{MOCK_API_URL}/login").mock(
+        return_value=Response(200, json={"return": [{"token": "abc"}]})
+    )
+    respx.post(f"{MOCK_API_URL}/").mock(side_effect=runner)
+    minions = respx.post(f"{MOCK_API_URL}/minions").mock(
+        return_value=Response(
+            200, json={"return": [{"jid": JID, "minions": ["stale"]}]}
+        )
+    )
+    respx.get(f"{MOCK_API_URL}/jobs/{JID}").mock(
+        return_value=Response(
+            200,
+            json={
+                "info": [{}],
+                "return": [{"stale": {"host": "stale", "num_cpus": 8}}],
+            },
+        )
+    )
+    client = await SaltAPIClient.create(MOCK_API_URL, "user", "pass")
+
+    cached = await client.get_cached_minion_grains("*", use_events=False)
+    await client.close()
+
+    lowstate = json.loads(minions.calls[0].request.content)[0]
+    assert (lowstate["tgt"], lowstate["tgt_type"]) == ("stale", "list")
+    assert not cached.root["fresh"].live
+    assert 50 < cached.root["fresh"].age < 70
+    assert cached.root["stale"].live
+    assert cached.root["stale"].grains.num_cpus == 8
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_cached_grains_of_unknown_age_are_kept_without_fallback():
+    def runner(request: Request) -> Response:
+        lowstate = json.loads(request.content)[0]
+        if lowstate["fun"] == "cache.grains":
+            return Response(200, json={"return": [{"web1": {"host": "web1"}}]})
+        return Response(200, json={"return": ["'salt.cmd' is not available."]})
+
+    respx.post(f"{MOCK_API_URL}/login").mock(
+        return_value=Response(200, json={"return": [{"token": "abc"}]})
+    )
+    respx.post(f"{MOCK_API_URL}/").mock(side_effect=runner)
+    minions = respx.post(f"{MOCK_API_URL}/minions")
+    client = await SaltAPIClient.create(
+        MOCK_API_URL,
+        "user",
+        "pass",
+        master_cache=MasterCacheConfig(live_fallback=False),
+    )
+
+    cached = await client.get_cached_minion_grains("*")
+    await client.close()
+
+    assert not minions.called
+    assert cached.root["web1"].grains.host == "web1"
+    assert cached.root["web1"].age is None
+    assert not cached.root["web1"].live
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_cached_grains_fallback_is_batched():
+    now = time.time()
+    submitted = []
+
+    def runner(request: Request) -> Response:
+        lowstate = json.loads(request.content)[0]
+        if lowstate["fun"] == "cache.grains":
+            result = {minion: {"host": minion} for minion in ("a", "b", "c")}
+        else:
+            result = [
+                [f"{MASTER_CACHE_DIR}/{minion}/data.p", now - 7200]
+                for minion in ("a", "b", "c")
+            ]
+        return Response(200, json={"return": [result]})
+
+    def submit(request: Request) -> Response:
+        lowstate = json.loads(request.content)[0]
+        submitted.append((lowstate["tgt"], lowstate["tgt_type"]))
+        minions = lowstate["tgt"].split(",")
+        jid = str(len(submitted))
+        return Response(200, json={"return": [{"jid": jid, "minions": minions}]})
+
+    def job_result(request: Request) -> Response:
+        returns = {
+            "/jobs/1": {"a": {"host": "a", "num_cpus": 8}},
+            "/jobs/2": {"c": {"host": "c", "num_cpus": 8}},
+        }[request.url.path]
+        return Response(200, json={"info": [{}], "return": [returns]})
+
+    respx.post(f"{MOCK_API_URL}/login").mock(
+        return_value=Response(200, json={"return": [{"token": "abc"}]})
+    )
+    respx.post(f"{MOCK_API_URL}/").mock(side_effect=runner)
+    respx.post(f"{MOCK_API_URL}/minions").mock(side_effect=submit)
+    respx.get(url__regex=rf"{MOCK_API_URL}/jobs/\d+").mock(side_effect=job_result)
+    client = await SaltAPIClient.create(MOCK_API_URL, "user", "pass")
+
+    grains = await client.get_minion_grains(
+        "*",
+        from_cache=True,
+        batch=BatchConfig(batch_size=2, max_concurrency=1),
+        timeout=0.05,
+        use_events=False,
+    )
+    await client.close()
+
+    assert submitted == [("a,b", "list"), ("c", "list")]
+    assert grains.root["a"].num_cpus == 8
+    assert grains.root["b"].host == "b"
+    assert grains.root["c"].num_cpus == 8
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+import respx
+from httpx import Request, Response
+
+from src.services.salt.batching import BatchConfig, split_batches
+from src.services.salt.client import SaltAPIClient
+
+MOCK_API_URL = "https://salt.api"
+
+
+def test_split_batches():
+    assert split_batches(["a", "b", "c"], 2) == [["a", "b"], ["c"]]
+    assert split_batches([], 2) == []
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_batched_grains_merge_sub_jobs_and_skip_stragglers():
+    submitted = []
+
+    def submit(request: Request) -> Response:
+        lowstate = json.loads(request.content)[0]
+        if lowstate["fun"] == "test.ping":
+            minions = ["web3", "web1", "web2"]
+            return Response(200, json={"return": [{"jid": "0", "minions": minions}]})
+        submitted.append((lowstate["tgt"], lowstate["tgt_type"]))
+        minions = lowstate["tgt"].split(",")
+        jid = str(len(submitted))
+        return Response(200, json={"return": [{"jid": jid, "minions": minions}]})
+
+    def job_result(request: Request) -> Response:
+        returns = {
+            "/jobs/1": {"web1": {"host": "web1"}, "web2": {"host": "web2"}},
+            "/jobs/2": {},
+        }[request.url.path]
+        return Response(200, json={"info": [{}], "return": [returns]})
+
+    respx.post(f"{MOCK_API_URL}/login").mock(
+        return_value=Response(200, json={"return": [{"token": "abc"}]})
+    )
+    respx.post(f"{MOCK_API_URL}/minions").mock(side_effect=submit)
+    respx.get(url__regex=rf"{MOCK_API_URL}/jobs/\d+").mock(side_effect=job_result)
+    client = await SaltAPIClient.create(MOCK_API_URL, "user", "pass")
+
+    grains = await client.get_minion_grains(
+        "web*",
+        batch=BatchConfig(batch_size=2, max_concurrency=1),
+        timeout=0.05,
+        use_events=False,
+    )
+    await client.close()
+
+    assert submitted == [("web1,web2", "list"), ("web3", "list")]
+    assert set(grains.root) == {"web1", "web2"}
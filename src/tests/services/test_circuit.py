@@ -0,0 +1,71 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from src.services.circuit import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitOpenError,
+    CircuitState,
+)
+from src.services.transport import HTTPConfig, create_client
+
+pytestmark = pytest.mark.asyncio
+
+MOCK_API_URL = "https://mock.api"
+
+
+@respx.mock
+async def test_circuit_opens_fails_fast_and_closes_after_probe():
+    route = respx.get(f"{MOCK_API_URL}/api/dcim/devices/").mock(
+        side_effect=httpx.ConnectError("refused")
+    )
+    probe = respx.get(f"{MOCK_API_URL}/api/status/").mock(
+        return_value=Response(200, json={})
+    )
+    breaker = CircuitBreaker(
+        CircuitBreakerConfig(failure_threshold=2, reset_timeout=0.01)
+    )
+    client = create_client(
+        HTTPConfig(retry=None),
+        base_url=MOCK_API_URL,
+        headers={"Authorization": "Token fake-token"},
+        breaker=breaker,
+        probe_path="/api/status/",
+    )
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            await client.get("/api/dcim/devices/")
+    with pytest.raises(CircuitOpenError):
+        await client.get("/api/dcim/devices/")
+    assert route.call_count == 2
+    assert breaker.state == CircuitState.OPEN
+
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+        if breaker.state == CircuitState.CLOSED:
+            break
+    await client.aclose()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert probe.calls[0].request.headers["Authorization"] == "Token fake-token"
+
+
+@respx.mock
+async def test_open_circuit_stops_retries():
+    route = respx.get(f"{MOCK_API_URL}/jobs/1").mock(return_value=Response(503))
+    client = create_client(
+        HTTPConfig(),
+        base_url=MOCK_API_URL,
+        breaker=CircuitBreaker(CircuitBreakerConfig(failure_threshold=1)),
+    )
+
+    with pytest.raises(CircuitOpenError):
+        await client.get("/jobs/1")
+    await client.aclose()
+
+    assert route.call_count == 1
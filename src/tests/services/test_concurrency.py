@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+import respx
+from httpx import Response
+
+from src.services.concurrency import AdaptiveLimiter, ConcurrencyConfig
+from src.services.transport import HTTPConfig, create_client
+
+pytestmark = pytest.mark.asyncio
+
+MOCK_API_URL = "https://mock.api"
+
+
+@respx.mock
+async def test_limiter_caps_in_flight_and_halves_on_throttling():
+    in_flight = peak = 0
+    calls = 0
+
+    async def responder(request):
+        nonlocal in_flight, peak, calls
+        calls += 1
+        call = calls
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if call == 5:
+            return Response(429, headers={"Retry-After": "0.05"})
+        return Response(200, json={})
+
+    respx.get(url__startswith=MOCK_API_URL).mock(side_effect=responder)
+    limiter = AdaptiveLimiter(ConcurrencyConfig(initial_limit=4, max_limit=8))
+    client = create_client(
+        HTTPConfig(retry=None), base_url=MOCK_API_URL, limiter=limiter
+    )
+
+    await asyncio.gather(*(client.get(f"/api/dcim/devices/{i}/") for i in range(12)))
+    await client.aclose()
+
+    assert peak <= 4
+    assert limiter.stats.throttled == 1
+    assert limiter.stats.decreases == 1
+    assert limiter.stats.requests == 12
+    assert limiter.stats.in_flight == 0
+
+
+async def test_limiter_grows_additively():
+    limiter = AdaptiveLimiter(ConcurrencyConfig(initial_limit=2, max_limit=3))
+    for _ in range(10):
+        await limiter.acquire()
+        await limiter.release(0.01, Response(200))
+
+    assert limiter.limit == 3
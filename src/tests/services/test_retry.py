@@ -0,0 +1,51 @@
+import pytest
+import respx
+from httpx import Response
+
+from src.services.retry import RetryBudget, RetryConfig
+from src.services.transport import HTTPConfig, create_client
+
+pytestmark = pytest.mark.asyncio
+
+MOCK_API_URL = "https://mock.api"
+FAST_RETRY = RetryConfig(initial_wait=0.001, max_wait=0.001)
+
+
+@respx.mock
+async def test_transient_errors_are_retried_and_counted_per_endpoint():
+    route = respx.get(f"{MOCK_API_URL}/api/dcim/devices/7/").mock(
+        side_effect=[Response(502), Response(503), Response(200, json={"id": 7})]
+    )
+    budget = RetryBudget(10)
+    client = create_client(
+        HTTPConfig(retry=FAST_RETRY), base_url=MOCK_API_URL, retry_budget=budget
+    )
+
+    response = await client.get("/api/dcim/devices/7/")
+    retries = client._transport.retries  # pyright: ignore
+    await client.aclose()
+
+    assert response.json() == {"id": 7}
+    assert route.call_count == 3
+    assert budget.used == 2
+    assert retries == {"GET /api/dcim/devices/{id}/": 2}
+
+
+@respx.mock
+async def test_non_idempotent_requests_and_exhausted_budget_are_not_retried():
+    post_route = respx.post(f"{MOCK_API_URL}/minions").mock(return_value=Response(503))
+    get_route = respx.get(f"{MOCK_API_URL}/jobs/1").mock(return_value=Response(503))
+    budget = RetryBudget(2)
+    client = create_client(
+        HTTPConfig(retry=FAST_RETRY), base_url=MOCK_API_URL, retry_budget=budget
+    )
+
+    assert (await client.post("/minions", json=[])).status_code == 503
+    assert (await client.get("/jobs/1")).status_code == 503
+    assert (await client.get("/jobs/1")).status_code == 503
+    await client.aclose()
+
+    assert post_route.call_count == 1
+    # Two retries for the first lookup, none left for the second.
+    assert get_route.call_count == 4
+    assert budget.exhausted
@@ -0,0 +1,94 @@
+import builtins
+import importlib
+import io
+import os
+from pathlib import Path
+
+import pytest
+import yaml
+from pydantic import BaseModel
+
+import src
+from src.services.models import SourceStatus
+
+pytestmark = pytest.mark.asyncio
+
+
+class Device(BaseModel):
+    id: int
+
+
+def settings_data(tmp_path) -> dict:
+    return {
+        "log_level": "INFO",
+        "xen": {},
+        "aws": {},
+        "salt": {
+            "api_url": "https://salt.api",
+            "username": "user",
+            "password": "pass",
+            "target_version": "3007",
+        },
+        "netbox": {
+            "base_url": "https://netbox.example",
+            "api_token": "token",
+            "ssl": True,
+        },
+        "paths": {"data_dir": str(tmp_path), "reports_dir": str(tmp_path)},
+        "output": {"csv_path": str(tmp_path / "out.csv")},
+        "device_export_map": {},
+        "vm_export_map": {},
+    }
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """
+    Imports `src.config` with the test settings served in place of
+    src/config.yaml, which is not part of the repository.
+    """
+    config_file = Path(src.__file__).parent / "config.yaml"
+    real_open = builtins.open
+
+    def open_config(file, *args, **kwargs):
+        if isinstance(file, (str, os.PathLike)) and Path(file) == config_file:
+            return io.StringIO(yaml.safe_dump(settings_data(tmp_path)))
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", open_config)
+    return importlib.import_module("src.config")
+
+
+async def test_failing_source_keeps_results_of_the_others(
+    config, tmp_path, monkeypatch
+):
+    service_gateway = importlib.import_module("src.services.service_gateway")
+    gateway = service_gateway.ServiceGateway(config.Settings(**settings_data(tmp_path)))
+
+    async def salt_grains(target):
+        return {"web1": {"host": "web1"}}
+
+    async def netbox_objects(endpoint_name, snapshot_name, model):
+        if endpoint_name == "devices":
+            Device.model_validate({"id": "not a number"})
+        return [endpoint_name]
+
+    async def broken_collector():
+        raise OSError("snapshot unreadable")
+
+    monkeypatch.setattr(gateway, "_salt_grains", salt_grains)
+    monkeypatch.setattr(gateway, "_netbox_objects", netbox_objects)
+    gateway.register_source("xen", broken_collector)
+
+    async with gateway:
+        response = await gateway.get_all_service_data()
+
+    assert response.salt.root["web1"].host == "web1"
+    assert response.netbox_devices is None
+    assert response.netbox_vms == ["vms"]
+    assert response.extra == {"xen": None}
+    assert sorted(response.failed_sources) == ["netbox_devices", "xen"]
+    assert response.sources["netbox_devices"].status == SourceStatus.FAILED
+    assert response.sources["netbox_devices"].error.startswith("ValidationError")
+    assert response.sources["xen"].error == "OSError: snapshot unreadable"
+    assert response.sources["salt"].status == SourceStatus.OK
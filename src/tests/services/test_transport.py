@@ -0,0 +1,45 @@
+import pytest
+import respx
+from httpx import Response
+
+from src.services.salt.client import SaltAPIClient
+from src.services.transport import HTTPConfig, create_client, create_transport
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_client_uses_configured_pool_timeouts_and_encoding():
+    config = HTTPConfig(
+        timeout=5,
+        connect_timeout=2,
+        max_connections=50,
+        compression=False,
+        retry=None,
+    )
+    client = create_client(config, base_url="https://mock.api")
+    pool = client._transport._pool  # pyright: ignore
+
+    assert pool._max_connections == 50
+    assert client.timeout.read == 5
+    assert client.timeout.connect == 2
+    assert client.headers["Accept-Encoding"] == "identity"
+    await client.aclose()
+
+
+async def test_http2_falls_back_without_h2(monkeypatch):
+    monkeypatch.setattr("src.services.transport._installed", lambda module: False)
+    transport = create_transport(HTTPConfig(http2=True))
+
+    assert transport._pool._http2 is False  # pyright: ignore
+    await transport.aclose()
+
+
+@respx.mock
+async def test_salt_client_negotiates_compression():
+    route = respx.post("https://salt.api/login").mock(
+        return_value=Response(200, json={"return": [{"token": "abc"}]})
+    )
+    client = await SaltAPIClient.create("https://salt.api", "user", "pass")
+    await client.close()
+
+    assert "gzip" in route.calls[0].request.headers["Accept-Encoding"]
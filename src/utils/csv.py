@@ -1,5 +1,6 @@
 import csv
 import logging
+from typing import Any, AsyncIterable, Dict, List
 
 log = logging.getLogger(__name__)
 
@@ -15,3 +16,22 @@ def write_csv(file_path, headers, rows):
         log.error(f"Error writing to CSV file {file_path}: {e}")
     except Exception as e:
         log.error(f"Unhandled exception writting to CSV file: {e}")
+
+
+async def write_csv_stream(
+    file_path, headers: List[str], row_chunks: AsyncIterable[List[Dict[str, Any]]]
+) -> int:
+    """
+    Writes rows to `file_path` chunk by chunk as they are produced and
+    returns the number of rows written. Errors, including those raised by
+    `row_chunks`, propagate so a partial file is never reported as success.
+    """
+    count = 0
+    with open(file_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=headers)
+        writer.writeheader()
+        async for rows in row_chunks:
+            writer.writerows(rows)
+            count += len(rows)
+    log.info(f"Successfully exported {count} rows to {file_path}")
+    return count
@@ -1,4 +1,5 @@
 import operator
+from collections.abc import Mapping
 from functools import reduce
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
@@ -50,7 +51,10 @@ def get_nested_attribute(obj: Any, path: str, default: Optional[Any] = None) ->
     for attr in attributes:
         if current_obj is None:
             return default
-        current_obj = getattr(current_obj, attr, default)
+        if isinstance(current_obj, Mapping):
+            current_obj = current_obj.get(attr, default)
+        else:
+            current_obj = getattr(current_obj, attr, default)
     return current_obj
 
 